@@ -0,0 +1,249 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+import cv2
+import numpy as np
+
+# Os scripts da pasta kernels/ importam uns aos outros pelo nome
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "kernels"))
+
+import espectro
+import fase_magnitude
+import filtro_baixa
+import main
+import ruido
+from ceu_sintetico import gerar_ceu
+from ex_laplaciano import detectar_estrelas
+from laplaciano import aplicar_laplaciano
+
+RAIZ = os.path.dirname(os.path.abspath(__file__))
+
+# Módulos cuja importação "a frio" é medida: nenhum deles pode carregar o matplotlib
+MODULOS_IMPORTACAO = ("main", "espectro", "gradientes", "convolucao", "filtro_baixa", "fase_magnitude",
+                      "filtros_frequencia", "laplaciano", "ex_laplaciano", "escala_espaco", "servidor", "ruido",
+                      "resposta_frequencia")
+
+# Tamanhos nomeados (altura, largura)
+TAMANHOS = {
+    "256": (256, 256),
+    "512": (512, 512),
+    "1024": (1024, 1024),
+    "2048": (2048, 2048),
+    "4k": (2160, 3840),
+    "8k": (4320, 7680),
+}
+
+
+def _sem_cache(funcao):
+    # Funções com @memoizar: mede a original, senão só mediríamos o cache
+    return getattr(funcao, "__wrapped__", funcao)
+
+
+def _mag_fase_ida_volta(imagem):
+    magnitude, fase = fase_magnitude.separar_mag_fase(imagem)
+    return fase_magnitude.reconstruir(magnitude, fase)
+
+
+def _mag_fase_lote(imagem):
+    magnitudes, fases = fase_magnitude.transformar_lote(imagem[None])
+    return fase_magnitude.reconstruir_lote(magnitudes, fases, imagem.shape)
+
+
+# Nome do caso -> (função que recebe a imagem, tipo de imagem de teste)
+CASOS = {
+    "aplicar_filtro_sobel": (_sem_cache(main.aplicar_filtro_sobel), "formas"),
+    "aplicar_filtro_prewitt_manual": (main.aplicar_filtro_prewitt_manual, "formas"),
+    "aplicar_laplaciano": (lambda img: aplicar_laplaciano(img, ""), "formas"),
+    "aplicar_filtro_passa_baixa": (_sem_cache(filtro_baixa.aplicar_filtro_passa_baixa), "formas"),
+    "calcular_fft": (_sem_cache(main.calcular_fft), "formas"),
+    "separar_mag_fase+reconstruir": (_mag_fase_ida_volta, "formas"),
+    "transformar_lote+reconstruir_lote": (_mag_fase_lote, "formas"),
+    "detectar_estrelas": (lambda img: detectar_estrelas(img, desenhar=False), "ceu"),
+    # O ruído é in-place: a cópia não estraga a imagem dos outros casos
+    "ruido_gaussiano": (lambda img: ruido.gaussiano(img.copy(), 20, faixa=(0, 255), rng=0), "formas"),
+    "ruido_sal_pimenta": (lambda img: ruido.sal_pimenta(img.copy(), 0.05, faixa=(0, 255), rng=0), "formas"),
+}
+
+
+def criar_imagem(tipo, forma, dtype, semente=0):
+    """Imagem de teste determinística (mesma semente -> mesma imagem)."""
+    altura, largura = forma
+    if tipo == "ceu":
+        num_estrelas = max(30, altura * largura // 2000)
+        imagem, _ = gerar_ceu(largura, altura, num_estrelas, semente=semente, poisson=False)
+    else:
+        # Formas geométricas + ruído: bordas em todas as direções
+        rng = np.random.default_rng(semente)
+        imagem = rng.integers(0, 40, forma, dtype=np.uint8)
+        cv2.rectangle(imagem, (largura // 8, altura // 8), (largura // 2, altura // 2), 255, -1)
+        cv2.circle(imagem, (3 * largura // 4, altura // 2), min(forma) // 5, 200, -1)
+    return imagem.astype(dtype)
+
+
+def definir_threads(threads):
+    cv2.setNumThreads(threads)
+    espectro.WORKERS = threads
+
+
+def medir(funcao, imagem, repeticoes):
+    funcao(imagem)  # Aquecimento (alocações, caches do OpenCV, etc.)
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao(imagem)
+        tempos.append(time.perf_counter() - inicio)
+    return tempos
+
+
+def executar(casos, tamanhos, dtypes, threads, repeticoes):
+    resultados = []
+    for tamanho in tamanhos:
+        for dtype in dtypes:
+            imagens = {}
+            for nome in casos:
+                funcao, tipo = CASOS[nome]
+                if tipo not in imagens:
+                    imagens[tipo] = criar_imagem(tipo, TAMANHOS[tamanho], dtype)
+                for n_threads in threads:
+                    definir_threads(n_threads)
+                    try:
+                        tempos = medir(funcao, imagens[tipo], repeticoes)
+                    except cv2.error as erro:
+                        # Ex.: combinação de dtype que o filtro não aceita
+                        print(f"{nome:32s} {tamanho:>5s} {dtype:8s} {n_threads:2d} threads | ERRO")
+                        resultados.append({"caso": nome, "tamanho": tamanho, "dtype": dtype,
+                                           "threads": n_threads, "erro": str(erro).strip()})
+                        continue
+                    resultado = {
+                        "caso": nome, "tamanho": tamanho, "dtype": dtype, "threads": n_threads,
+                        "mediana_s": statistics.median(tempos), "min_s": min(tempos),
+                        "repeticoes": repeticoes,
+                    }
+                    resultados.append(resultado)
+                    print(f"{nome:32s} {tamanho:>5s} {dtype:8s} {n_threads:2d} threads "
+                          f"| mediana {resultado['mediana_s'] * 1000:9.2f} ms")
+    return resultados
+
+
+def medir_importacao(modulo, repeticoes):
+    """
+    Tempo de 'import modulo' num interpretador novo (sem nada em cache na
+    memória) e se ele acabou carregando o matplotlib.
+    """
+    codigo = ("import sys, time; inicio = time.perf_counter(); import {0}; "
+              "print(time.perf_counter() - inicio, 'matplotlib' in sys.modules)").format(modulo)
+    ambiente = dict(os.environ, PYTHONPATH=os.pathsep.join([RAIZ, os.path.join(RAIZ, "kernels")]))
+    tempos = []
+    for _ in range(repeticoes):
+        saida = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True,
+                               env=ambiente, check=True).stdout.split()
+        tempos.append(float(saida[0]))
+    return tempos, saida[1] == "True"
+
+
+def executar_importacao(modulos, repeticoes):
+    resultados = []
+    for modulo in modulos:
+        tempos, carrega_matplotlib = medir_importacao(modulo, repeticoes)
+        resultado = {
+            "caso": f"importar {modulo}", "tamanho": "-", "dtype": "-", "threads": 0,
+            "mediana_s": statistics.median(tempos), "min_s": min(tempos),
+            "repeticoes": repeticoes, "carrega_matplotlib": carrega_matplotlib,
+        }
+        resultados.append(resultado)
+        print(f"{'importar ' + modulo:32s} | mediana {resultado['mediana_s'] * 1000:9.2f} ms"
+              + ("  <-- CARREGA O MATPLOTLIB" if carrega_matplotlib else ""))
+    return resultados
+
+
+def _chave(resultado):
+    return resultado["caso"], resultado["tamanho"], resultado["dtype"], resultado["threads"]
+
+
+def comparar(resultados, baseline, tolerancia):
+    """Lista as regressões: mediana mais de 'tolerancia'% acima da baseline."""
+    referencia = {_chave(r): r for r in baseline["resultados"]}
+    regressoes = []
+    for resultado in resultados:
+        anterior = referencia.get(_chave(resultado))
+        if anterior is None or "erro" in resultado or "erro" in anterior:
+            continue
+        variacao = 100 * (resultado["mediana_s"] / anterior["mediana_s"] - 1)
+        resultado["variacao_pct"] = variacao
+        if variacao > tolerancia:
+            regressoes.append(resultado)
+    return regressoes
+
+
+def metadados():
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "opencv": cv2.__version__,
+        "plataforma": platform.platform(),
+        "processador": platform.processor(),
+        "nucleos": os.cpu_count(),
+        "data": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Benchmark dos filtros e transformadas do projeto.")
+    parser.add_argument("--casos", nargs="+", choices=sorted(CASOS), default=sorted(CASOS))
+    parser.add_argument("--tamanhos", nargs="+", choices=list(TAMANHOS), default=["256", "1024", "4k"])
+    parser.add_argument("--dtypes", nargs="+", choices=("uint8", "float32"), default=["uint8"])
+    parser.add_argument("--threads", nargs="+", type=int, default=[1, os.cpu_count() or 1])
+    parser.add_argument("-r", "--repeticoes", type=int, default=5)
+    parser.add_argument("--importacao", action="store_true",
+                        help="Mede também o tempo de importação dos módulos (falha se algum carregar o matplotlib)")
+    parser.add_argument("--limite-importacao-ms", type=float, default=None,
+                        help="Tempo máximo de importação de cada módulo (falha se passar)")
+    parser.add_argument("-o", "--saida", default="benchmark_resultados.json", help="JSON com os resultados")
+    parser.add_argument("-b", "--baseline", help="JSON de uma execução anterior para comparar")
+    parser.add_argument("-t", "--tolerancia", type=float, default=10.0,
+                        help="Piora máxima aceita em relação à baseline (%%)")
+    args = parser.parse_args()
+
+    resultados = executar(args.casos, args.tamanhos, args.dtypes, sorted(set(args.threads)), args.repeticoes)
+
+    falhas_importacao = []
+    if args.importacao:
+        importacoes = executar_importacao(MODULOS_IMPORTACAO, args.repeticoes)
+        resultados += importacoes
+        for r in importacoes:
+            if r["carrega_matplotlib"]:
+                falhas_importacao.append(f"{r['caso']}: carrega o matplotlib")
+            elif args.limite_importacao_ms and r["mediana_s"] * 1000 > args.limite_importacao_ms:
+                falhas_importacao.append(f"{r['caso']}: {r['mediana_s'] * 1000:.0f} ms "
+                                         f"(limite {args.limite_importacao_ms:.0f} ms)")
+
+    regressoes = []
+    if args.baseline:
+        with open(args.baseline) as arquivo:
+            regressoes = comparar(resultados, json.load(arquivo), args.tolerancia)
+
+    with open(args.saida, "w") as arquivo:
+        json.dump({"metadados": metadados(), "tolerancia_pct": args.tolerancia,
+                   "resultados": resultados}, arquivo, indent=2)
+    print(f"Resultados gravados em '{args.saida}'.")
+
+    if regressoes:
+        print(f"--- {len(regressoes)} REGRESSÕES (> {args.tolerancia:.0f}%) ---")
+        for r in regressoes:
+            print(f"{r['caso']} {r['tamanho']} {r['dtype']} {r['threads']} threads: +{r['variacao_pct']:.1f}%")
+    if falhas_importacao:
+        print(f"--- {len(falhas_importacao)} FALHAS DE IMPORTAÇÃO ---")
+        for falha in falhas_importacao:
+            print(falha)
+    if regressoes or falhas_importacao:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,163 @@
+import functools
+import hashlib
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+
+class CacheResultados:
+    """
+    Cache de resultados (memoização) endereçado pelo CONTEÚDO das imagens.
+
+    A chave combina o nome da operação, o hash dos bytes de cada imagem
+    (mais formato e dtype) e os demais parâmetros. Tem dois níveis:
+    - memória: LRU limitado em bytes;
+    - disco (opcional): arquivos .npy, removendo os mais antigos quando
+      o diretório passa do tamanho máximo.
+    """
+
+    def __init__(self, max_bytes=256 * 1024**2, diretorio=None, max_bytes_disco=2 * 1024**3):
+        self.max_bytes = max_bytes
+        self.diretorio = None
+        self.max_bytes_disco = max_bytes_disco
+        self._memoria = OrderedDict()
+        self._bytes_memoria = 0
+        self.acertos = 0
+        self.acertos_disco = 0
+        self.falhas = 0
+        if diretorio is not None:
+            self.configurar_disco(diretorio, max_bytes_disco)
+
+    def configurar_disco(self, diretorio, max_bytes_disco=None):
+        """Ativa o nível em disco (None desativa)."""
+        self.diretorio = diretorio
+        if max_bytes_disco is not None:
+            self.max_bytes_disco = max_bytes_disco
+        if diretorio is not None:
+            os.makedirs(diretorio, exist_ok=True)
+
+    @staticmethod
+    def gerar_chave(nome, args, kwargs):
+        """Hash da operação + conteúdo/formato/dtype dos arrays + parâmetros."""
+        h = hashlib.blake2b(digest_size=20)
+        h.update(nome.encode())
+        itens = [(None, valor) for valor in args] + sorted(kwargs.items())
+        for parametro, valor in itens:
+            if parametro is not None:
+                h.update(parametro.encode())
+            if isinstance(valor, np.ndarray):
+                h.update(f"{valor.shape}{valor.dtype.str}".encode())
+                h.update(memoryview(np.ascontiguousarray(valor)).cast("B"))
+            else:
+                h.update(repr(valor).encode())
+        return h.hexdigest()
+
+    def obter(self, chave):
+        """Retorna (True, valor) em caso de acerto ou (False, None)."""
+        if chave in self._memoria:
+            self._memoria.move_to_end(chave)
+            self.acertos += 1
+            return True, self._memoria[chave]
+
+        if self.diretorio is not None:
+            caminho = os.path.join(self.diretorio, chave + ".npy")
+            if os.path.exists(caminho):
+                valor = np.load(caminho)
+                os.utime(caminho)  # Marca como usado recentemente
+                self.acertos_disco += 1
+                return True, self._guardar_memoria(chave, valor)
+
+        self.falhas += 1
+        return False, None
+
+    def guardar(self, chave, valor):
+        valor = self._guardar_memoria(chave, valor)
+        if self.diretorio is not None and isinstance(valor, np.ndarray):
+            np.save(os.path.join(self.diretorio, chave + ".npy"), valor)
+            self._despejar_disco()
+        return valor
+
+    def _guardar_memoria(self, chave, valor):
+        if isinstance(valor, np.ndarray):
+            # O mesmo array é devolvido em todos os acertos: proibimos escrita
+            valor.setflags(write=False)
+        tamanho = getattr(valor, "nbytes", 0)
+        if tamanho > self.max_bytes:
+            return valor  # Maior que o cache inteiro: não guarda
+
+        if chave in self._memoria:
+            self._bytes_memoria -= getattr(self._memoria.pop(chave), "nbytes", 0)
+        self._memoria[chave] = valor
+        self._bytes_memoria += tamanho
+
+        # Remove os menos usados (início do OrderedDict) até caber
+        while self._bytes_memoria > self.max_bytes:
+            _, antigo = self._memoria.popitem(last=False)
+            self._bytes_memoria -= getattr(antigo, "nbytes", 0)
+        return valor
+
+    def _despejar_disco(self):
+        arquivos = []
+        total = 0
+        with os.scandir(self.diretorio) as entradas:
+            for entrada in entradas:
+                if entrada.name.endswith(".npy"):
+                    info = entrada.stat()
+                    arquivos.append((info.st_mtime, info.st_size, entrada.path))
+                    total += info.st_size
+
+        # Apaga os mais antigos até voltar ao limite
+        arquivos.sort()
+        for _, tamanho, caminho in arquivos:
+            if total <= self.max_bytes_disco:
+                break
+            try:
+                os.remove(caminho)
+            except FileNotFoundError:
+                pass
+            total -= tamanho
+
+    def limpar(self):
+        """Esvazia o nível em memória e zera os contadores."""
+        self._memoria.clear()
+        self._bytes_memoria = 0
+        self.acertos = self.acertos_disco = self.falhas = 0
+
+    def estatisticas(self):
+        return {
+            "acertos": self.acertos,
+            "acertos_disco": self.acertos_disco,
+            "falhas": self.falhas,
+            "itens": len(self._memoria),
+            "bytes_memoria": self._bytes_memoria,
+        }
+
+
+# Cache compartilhado por todos os scripts do projeto
+CACHE_PADRAO = CacheResultados()
+
+
+def memoizar(funcao=None, cache=None):
+    """
+    Decorador: guarda o resultado da função no cache, indexado pelo
+    conteúdo das imagens recebidas. A função original fica em
+    'funcao.__wrapped__' (útil para medir tempo sem cache).
+
+    Os arrays devolvidos são somente-leitura, pois são compartilhados.
+    """
+    if funcao is None:
+        return functools.partial(memoizar, cache=cache)
+
+    nome = f"{funcao.__module__}.{funcao.__qualname__}"
+
+    @functools.wraps(funcao)
+    def envoltorio(*args, **kwargs):
+        alvo = cache if cache is not None else CACHE_PADRAO
+        chave = alvo.gerar_chave(nome, args, kwargs)
+        achou, valor = alvo.obter(chave)
+        if achou:
+            return valor
+        return alvo.guardar(chave, funcao(*args, **kwargs))
+
+    return envoltorio
@@ -0,0 +1,275 @@
+import functools
+import json
+import math
+import time
+
+import cv2
+import numpy as np
+
+import espectro
+
+# Modelo de custo (segundos por operação elementar). Os valores padrão são
+# uma estimativa razoável; use calibrar() para medi-los na máquina atual.
+CUSTOS = {
+    "espacial": 1.5e-10,  # por multiplicação do kernel, por pixel
+    "fft": 1.2e-9,        # por elemento * log2(elementos) de cada FFT
+}
+
+# A partir de ~50 elementos o cv2.filter2D troca sozinho para a DFT
+LIMIAR_DFT_OPENCV = 50
+
+
+@functools.lru_cache(maxsize=256)
+def _decompor_cache(dados, forma, dtype, tolerancia):
+    kernel = np.frombuffer(dados, dtype=dtype).reshape(forma).astype(np.float64)
+    return _decompor(kernel, tolerancia)
+
+
+def _decompor(kernel, tolerancia):
+    u, s, vt = np.linalg.svd(kernel)
+    if s[0] == 0:
+        return ()
+
+    # Posto numérico: quantos valores singulares são relevantes
+    posto = int(np.sum(s > tolerancia * s[0]))
+
+    if posto == 1:
+        # Para posto 1 usamos o pivô (maior elemento) em vez do SVD:
+        # kernel = coluna_do_pivo * (linha_do_pivo / pivo).
+        # Em kernels inteiros (Sobel, Prewitt) isso é EXATO, sem erro de arredondamento.
+        i, j = np.unravel_index(np.argmax(np.abs(kernel)), kernel.shape)
+        coluna = kernel[:, j].copy()
+        linha = kernel[i, :] / kernel[i, j]
+        return ((coluna, linha),)
+
+    # Posto baixo: soma de 'posto' pares separáveis (coluna_i * linha_i)
+    raiz = np.sqrt(s[:posto])
+    return tuple((u[:, i] * raiz[i], vt[i] * raiz[i]) for i in range(posto))
+
+
+def decompor_kernel(kernel, tolerancia=1e-6):
+    """
+    Decompõe um kernel 2D em pares 1D (coluna, linha) tais que
+    kernel = soma(coluna_i * linha_i^T). Um único par = kernel SEPARÁVEL.
+    O resultado é guardado em cache por kernel.
+    """
+    kernel = np.ascontiguousarray(kernel)
+    if kernel.ndim != 2:
+        raise ValueError(f"Kernel deve ser 2D, recebido formato {kernel.shape}.")
+    return _decompor_cache(kernel.tobytes(), kernel.shape, kernel.dtype.str, tolerancia)
+
+
+def _profundidade_float(imagem, ddepth):
+    if ddepth == cv2.CV_64F or imagem.dtype == np.float64:
+        return cv2.CV_64F
+    return cv2.CV_32F
+
+
+def _converter_profundidade(resultado, imagem, ddepth):
+    """Converte o acumulador float para a profundidade pedida (com saturação, como o OpenCV)."""
+    destino = imagem.dtype if ddepth == -1 else None
+    if destino is None:
+        tipos = {cv2.CV_8U: np.uint8, cv2.CV_16U: np.uint16, cv2.CV_16S: np.int16,
+                 cv2.CV_32F: np.float32, cv2.CV_64F: np.float64}
+        destino = tipos[ddepth]
+    destino = np.dtype(destino)
+    if destino.kind == "f":
+        return resultado.astype(destino, copy=False)
+    info = np.iinfo(destino)
+    np.rint(resultado, out=resultado)
+    np.clip(resultado, info.min, info.max, out=resultado)
+    return resultado.astype(destino)
+
+
+def convoluir(imagem, ddepth, kernel, tolerancia=1e-6):
+    """
+    Substituto de cv2.filter2D(imagem, ddepth, kernel) que escolhe o caminho
+    mais barato:
+    - kernel separável (posto 1): duas passadas 1D (sepFilter2D), O(k) por pixel;
+    - posto baixo r: r pares de passadas 1D somados, O(r*k) por pixel;
+    - caso contrário: filter2D direto, O(k^2) por pixel.
+    O resultado concorda com filter2D dentro da tolerância de ponto flutuante.
+    """
+    kernel = np.asarray(kernel)
+    altura_k, largura_k = kernel.shape
+    pares = decompor_kernel(kernel, tolerancia)
+
+    # Custo por pixel de cada caminho (multiplicações)
+    custo_2d = altura_k * largura_k
+    custo_separavel = len(pares) * (altura_k + largura_k)
+    if not pares or custo_separavel >= custo_2d:
+        return cv2.filter2D(imagem, ddepth, kernel)
+
+    if len(pares) == 1:
+        coluna, linha = pares[0]
+        return cv2.sepFilter2D(imagem, ddepth, linha, coluna)
+
+    # Vários pares: acumula em float e só converte no final
+    profundidade = _profundidade_float(imagem, ddepth)
+    acumulado = None
+    for coluna, linha in pares:
+        parcial = cv2.sepFilter2D(imagem, profundidade, linha, coluna)
+        if acumulado is None:
+            acumulado = parcial
+        else:
+            acumulado += parcial
+    return _converter_profundidade(acumulado, imagem, ddepth)
+
+
+def _tamanho_bloco(forma_imagem, forma_kernel):
+    """Bloco do overlap-add: algumas vezes o kernel, sem passar da imagem."""
+    lado_kernel = max(forma_kernel)
+    bloco = max(256, 4 * lado_kernel)
+    return min(bloco, max(forma_imagem))
+
+
+def _forma_fft(bloco, forma_kernel):
+    # Tamanhos "bons" para a FFT (produtos de 2, 3 e 5)
+    return (cv2.getOptimalDFTSize(bloco + forma_kernel[0] - 1),
+            cv2.getOptimalDFTSize(bloco + forma_kernel[1] - 1))
+
+
+def estimar_custos(forma_imagem, forma_kernel, posto=None):
+    """
+    Estima o tempo (s) dos dois caminhos para uma imagem e um kernel:
+    - espacial: pixels * multiplicações por pixel (k^2, ou posto*2k se separável);
+    - fft: overlap-add em blocos, 2 FFTs por bloco de M elementos ~ M*log2(M).
+    """
+    altura, largura = forma_imagem[:2]
+    altura_k, largura_k = forma_kernel
+    operacoes = altura_k * largura_k
+    if posto:
+        operacoes = min(operacoes, posto * (altura_k + largura_k))
+    espacial = CUSTOS["espacial"] * altura * largura * operacoes
+
+    bloco = _tamanho_bloco(forma_imagem, forma_kernel)
+    forma_fft = _forma_fft(bloco, forma_kernel)
+    elementos = forma_fft[0] * forma_fft[1]
+    blocos = math.ceil(altura / bloco) * math.ceil(largura / bloco)
+    fft = CUSTOS["fft"] * blocos * 2 * elementos * math.log2(elementos)
+    return {"espacial": espacial, "fft": fft}
+
+
+def convolucao_fft(imagem, ddepth, kernel, bloco=None):
+    """
+    Mesmo resultado de cv2.filter2D (correlação, borda REFLECT_101),
+    calculado no domínio da frequência por OVERLAP-ADD:
+    a imagem é cortada em blocos, cada bloco é convoluído via FFT real
+    com o kernel (transformado uma única vez) e os resultados, que se
+    sobrepõem em k-1 pixels, são somados.
+    """
+    if imagem.ndim != 2:
+        raise ValueError("convolucao_fft aceita apenas imagens 2D (um canal).")
+    kernel = np.asarray(kernel, dtype=np.float64)
+    altura_k, largura_k = kernel.shape
+    altura, largura = imagem.shape
+    tipo = np.float64 if imagem.dtype == np.float64 or ddepth == cv2.CV_64F else np.float32
+
+    # 1. Borda igual à do filter2D (âncora no centro do kernel)
+    ancora_y, ancora_x = altura_k // 2, largura_k // 2
+    preenchida = cv2.copyMakeBorder(imagem.astype(tipo, copy=False),
+                                    ancora_y, altura_k - 1 - ancora_y,
+                                    ancora_x, largura_k - 1 - ancora_x,
+                                    cv2.BORDER_REFLECT_101)
+    altura_p, largura_p = preenchida.shape
+
+    # 2. filter2D faz CORRELAÇÃO: equivale a convoluir com o kernel invertido
+    if bloco is None:
+        bloco = _tamanho_bloco(imagem.shape, kernel.shape)
+    forma_fft = _forma_fft(bloco, kernel.shape)
+    kernel_f = espectro.rfft2(kernel[::-1, ::-1].astype(tipo), forma=forma_fft)
+
+    # 3. Overlap-add: cada bloco gera (bloco + k - 1) pixels, somados no acumulador
+    acumulado = np.zeros((altura_p + altura_k - 1, largura_p + largura_k - 1), dtype=tipo)
+    for y0 in range(0, altura_p, bloco):
+        for x0 in range(0, largura_p, bloco):
+            pedaco = preenchida[y0:y0 + bloco, x0:x0 + bloco]
+            saida_y = pedaco.shape[0] + altura_k - 1
+            saida_x = pedaco.shape[1] + largura_k - 1
+            produto = espectro.rfft2(pedaco, forma=forma_fft)
+            produto *= kernel_f
+            convoluido = espectro.irfft2(produto, forma_fft)
+            acumulado[y0:y0 + saida_y, x0:x0 + saida_x] += convoluido[:saida_y, :saida_x]
+
+    # 4. Só a parte "válida" corresponde à imagem original
+    resultado = acumulado[altura_k - 1:altura_p, largura_k - 1:largura_p]
+    return _converter_profundidade(np.ascontiguousarray(resultado), imagem, ddepth)
+
+
+def convoluir_auto(imagem, ddepth, kernel):
+    """
+    Escolhe automaticamente entre convolução espacial (convoluir) e no
+    domínio da frequência (convolucao_fft) pelo modelo de custo.
+    """
+    kernel = np.asarray(kernel)
+    if imagem.ndim != 2:
+        return convoluir(imagem, ddepth, kernel)
+
+    altura_k, largura_k = kernel.shape
+    posto = len(decompor_kernel(kernel))
+    separavel_compensa = posto * (altura_k + largura_k) < altura_k * largura_k
+    if not separavel_compensa and altura_k * largura_k >= LIMIAR_DFT_OPENCV:
+        # Kernel grande e não separável: o próprio filter2D já usa DFT
+        return convoluir(imagem, ddepth, kernel)
+
+    custos = estimar_custos(imagem.shape, kernel.shape, posto)
+    if custos["fft"] < custos["espacial"]:
+        return convolucao_fft(imagem, ddepth, kernel)
+    return convoluir(imagem, ddepth, kernel)
+
+
+def _medir(funcao, repeticoes):
+    funcao()  # Aquecimento
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def calibrar(tamanho_imagem=1024, tamanhos_kernel=(3, 15, 63, 127, 255), repeticoes=3, caminho=None):
+    """
+    Mede na máquina atual os dois caminhos com kernels Gaussianos (o caso
+    típico do passa-baixa), ajusta CUSTOS e encontra o tamanho de kernel a
+    partir do qual a FFT fica mais rápida (ponto de cruzamento).
+    Se 'caminho' for dado, salva o resultado em JSON.
+    """
+    rng = np.random.default_rng(0)
+    imagem = rng.random((tamanho_imagem, tamanho_imagem), dtype=np.float32)
+
+    medicoes = []
+    custo_espacial = []
+    custo_fft = []
+    antigo = dict(CUSTOS)
+    for k in tamanhos_kernel:
+        gauss = cv2.getGaussianKernel(k, 0)
+        kernel = (gauss * gauss.T).astype(np.float32)
+        t_espacial = _medir(lambda: convoluir(imagem, -1, kernel), repeticoes)
+        t_fft = _medir(lambda: convolucao_fft(imagem, -1, kernel), repeticoes)
+        medicoes.append({"kernel": k, "espacial": t_espacial, "fft": t_fft})
+
+        # Com custos unitários, estimar_custos devolve só a contagem de operações
+        CUSTOS.update({"espacial": 1.0, "fft": 1.0})
+        operacoes = estimar_custos(imagem.shape, kernel.shape, posto=1)
+        CUSTOS.update(antigo)
+        custo_espacial.append(t_espacial / operacoes["espacial"])
+        custo_fft.append(t_fft / operacoes["fft"])
+
+    # Mediana é robusta a uma medição ruim
+    CUSTOS["espacial"] = float(np.median(custo_espacial))
+    CUSTOS["fft"] = float(np.median(custo_fft))
+
+    cruzamento = next((m["kernel"] for m in medicoes if m["fft"] < m["espacial"]), None)
+    resultado = {"custos": dict(CUSTOS), "cruzamento_kernel": cruzamento, "medicoes": medicoes}
+    if caminho is not None:
+        with open(caminho, "w") as arquivo:
+            json.dump(resultado, arquivo, indent=2)
+    return resultado
+
+
+def carregar_calibracao(caminho):
+    """Carrega os custos medidos por calibrar(caminho=...)."""
+    with open(caminho) as arquivo:
+        CUSTOS.update(json.load(arquivo)["custos"])
+    return dict(CUSTOS)
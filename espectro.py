@@ -0,0 +1,104 @@
+import os
+import numpy as np
+
+# O scipy.fft aceita o parâmetro 'workers' (FFT multi-thread).
+# Se ele não estiver instalado, usamos o numpy.fft (single-thread).
+try:
+    import scipy.fft as _fft
+    _TEM_WORKERS = True
+except ImportError:
+    _fft = np.fft
+    _TEM_WORKERS = False
+
+# Número padrão de threads da FFT (None = todos os núcleos da máquina)
+WORKERS = None
+
+
+def _resolver_workers(workers):
+    if workers is None:
+        workers = WORKERS
+    if workers is None:
+        workers = os.cpu_count() or 1
+    return workers
+
+
+def rfft2(dados, workers=None, forma=None):
+    """
+    FFT 2D de entrada REAL nos dois últimos eixos (aceita pilhas de imagens).
+    Retorna só a metade não redundante do espectro: (..., H, W//2 + 1).
+    'forma' = (H, W) opcional para completar com zeros antes da FFT.
+    """
+    if _TEM_WORKERS:
+        return _fft.rfft2(dados, s=forma, axes=(-2, -1), workers=_resolver_workers(workers))
+    return _fft.rfft2(dados, s=forma, axes=(-2, -1))
+
+
+def irfft2(espectro, forma, workers=None):
+    """Inversa da rfft2. 'forma' é o (H, W) original da imagem."""
+    if _TEM_WORKERS:
+        return _fft.irfft2(espectro, s=forma, axes=(-2, -1), workers=_resolver_workers(workers))
+    return _fft.irfft2(espectro, s=forma, axes=(-2, -1))
+
+
+def log_magnitude(espectro_complexo, epsilon=1, out=None):
+    """
+    Calcula 20 * log(|F| + epsilon) usando um único buffer real.
+    Todas as operações são feitas IN-PLACE sobre 'out'.
+    """
+    if out is None:
+        out = np.empty(espectro_complexo.shape, dtype=espectro_complexo.real.dtype)
+    np.abs(espectro_complexo, out=out)
+    out += epsilon
+    np.log(out, out=out)
+    out *= 20
+    return out
+
+
+def expandir_espectro(meia, largura):
+    """
+    Reconstrói o espectro completo (H, W) e centralizado (com fftshift)
+    a partir da metade calculada pela rfft2.
+
+    Para imagens reais vale a simetria hermitiana: |F(-u, -v)| = |F(u, v)|,
+    então as colunas que faltam são a metade calculada espelhada.
+    """
+    altura, meia_largura = meia.shape[-2:]
+    completo = np.empty(meia.shape[:-2] + (altura, largura), dtype=meia.dtype)
+    completo[..., :meia_largura] = meia
+
+    # Colunas j >= W//2 + 1 vêm da coluna (W - j) e da linha (-i mod H)
+    resto = largura - meia_largura
+    if resto > 0:
+        completo[..., 0, meia_largura:] = meia[..., 0, resto:0:-1]
+        completo[..., 1:, meia_largura:] = meia[..., :0:-1, resto:0:-1]
+
+    # Move a frequência zero (DC) dos cantos para o centro
+    return np.fft.fftshift(completo, axes=(-2, -1))
+
+
+def calcular_espectro(imagem, precisao=np.float64, epsilon=1, workers=None):
+    """
+    Espectro de magnitude logarítmico e centralizado de uma imagem
+    (ou de uma pilha de imagens com formato (N, H, W)).
+
+    Equivale a 20 * log(|fftshift(fft2(imagem))| + epsilon), mas:
+    - usa a FFT real (metade do espectro, metade da memória);
+    - aceita precisão float32 (complex64), bem mais rápida;
+    - faz o log da magnitude in-place, só na metade calculada.
+    """
+    dados = np.asarray(imagem, dtype=precisao)
+    meia = rfft2(dados, workers=workers)
+    meia_log = log_magnitude(meia, epsilon)
+    return expandir_espectro(meia_log, dados.shape[-1])
+
+
+def calcular_espectros_lote(imagens, precisao=np.float64, epsilon=1, workers=None):
+    """
+    Calcula os espectros de várias imagens de mesmo tamanho de uma só vez.
+    'imagens' pode ser uma lista de imagens 2D ou um array (N, H, W).
+    Retorna um array (N, H, W) com um espectro por imagem.
+    """
+    pilha = np.asarray(imagens, dtype=precisao)
+    if pilha.ndim != 3:
+        raise ValueError(f"Esperado um lote (N, H, W), recebido formato {pilha.shape}.")
+    return calcular_espectro(pilha, precisao=precisao, epsilon=epsilon, workers=workers)
@@ -1,6 +1,8 @@
 import cv2
 import numpy as np
-import matplotlib.pyplot as plt
+
+import espectro
+import montagem
 
 def carregar_imagem(caminho):
     """Carrega imagem em escala de cinza e redimensiona para tamanho fixo."""
@@ -40,7 +42,64 @@ def reconstruir(magnitude, fase):
     # Retorna apenas a parte real (despreza erros numéricos imaginários)
     return np.abs(img_back)
 
-def main():
+def transformar_lote(imagens, workers=None):
+    """
+    Uma rfft2 (float32 -> complex64) por imagem de um lote (N, H, W).
+    Retorna (magnitudes, fases), cada um float32 (N, H, W//2 + 1):
+    só a metade não redundante do espectro, sem fftshift.
+    """
+    dados = np.asarray(imagens, dtype=np.float32)
+    if dados.ndim != 3:
+        raise ValueError(f"Esperado lote (N, H, W), recebido formato {dados.shape}.")
+    espectros = espectro.rfft2(dados, workers=workers)
+    return np.abs(espectros), np.angle(espectros)
+
+def _unitario(fase, out):
+    # e^(j*Fase) = cos(Fase) + j*sen(Fase), escrito direto no buffer complexo
+    np.cos(fase, out=out.real)
+    np.sin(fase, out=out.imag)
+    return out
+
+def reconstruir_lote(magnitudes, fases, forma, pares=None, workers=None):
+    """
+    Reconstrói imagens a partir de combinações de magnitude e fase do lote.
+
+    - pares=None: TODAS as N x N combinações, resultado (N, N, H, W) com
+      resultado[i, j] = Magnitude(i) + Fase(j) (a diagonal são os originais);
+    - pares=[(i, j), ...]: só as combinações pedidas, resultado (P, H, W).
+
+    O complexo é montado direto em complex64, sem np.exp e sem temporários:
+    cos(Fase) e sen(Fase) são escritos nas partes real/imaginária do próprio
+    buffer que vai para a irfft2, que então é multiplicado pela magnitude.
+    'forma' é o (H, W) das imagens originais.
+    """
+    magnitudes = np.asarray(magnitudes, dtype=np.float32)
+    fases = np.asarray(fases, dtype=np.float32)
+    meia_forma = magnitudes.shape[1:]
+
+    if pares is None:
+        n_mag, n_fase = len(magnitudes), len(fases)
+        combinados = np.empty((n_mag, n_fase) + meia_forma, dtype=np.complex64)
+        for j in range(n_fase):
+            # e^(j*Fase) calculado UMA vez por fase, na primeira linha,
+            # e escalado por cada magnitude (a linha 0 por último, in-place)
+            unitario = combinados[0, j]
+            _unitario(fases[j], unitario)
+            for i in range(n_mag - 1, -1, -1):
+                np.multiply(unitario, magnitudes[i], out=combinados[i, j])
+    else:
+        combinados = np.empty((len(pares),) + meia_forma, dtype=np.complex64)
+        for k, (i, j) in enumerate(pares):
+            _unitario(fases[j], combinados[k])
+            combinados[k] *= magnitudes[i]
+
+    # Mag e fase vêm de espectros de imagens reais (simetria hermitiana):
+    # a inversa é real, como a parte real do ifft2 completo
+    imagens = espectro.irfft2(combinados, forma, workers=workers)
+    return np.abs(imagens, out=imagens)
+
+def main(saida=None):
+    """Mostra os experimentos numa janela ou, se 'saida' for dada, grava o PNG."""
     # --- 1. Carregue duas imagens diferentes aqui ---
     # Sugestão: Uma foto de rosto e uma de um prédio/objeto geométrico
     img1 = carregar_imagem('luffy.jpg') # Coloque o nome da sua imagem
@@ -58,71 +117,46 @@ def main():
         cv2.rectangle(img2, (50, 50), (250, 250), 255, -1)
 
     # --- 2. Extração de Componentes ---
-    mag1, fase1 = separar_mag_fase(img1)
-    mag2, fase2 = separar_mag_fase(img2)
+    # Uma FFT por imagem, para o lote inteiro
+    forma = img1.shape
+    magnitudes, fases = transformar_lote(np.stack([img1, img2]))
 
     # --- 3. Experimento A: Isolamento (Só Mag ou Só Fase) ---
     # Para ver SÓ a magnitude, zeramos a fase (fase = 0)
-    rec_so_mag1 = reconstruir(mag1, np.zeros_like(fase1))
-    
     # Para ver SÓ a fase, tornamos a magnitude constante (mag = 1)
     # Isso nivela o contraste de todas as frequências
-    rec_so_fase1 = reconstruir(np.ones_like(mag1), fase1)
+    rec_so_mag1, rec_so_fase1 = reconstruir_lote(
+        np.stack([magnitudes[0], np.ones_like(magnitudes[0])]),
+        np.stack([np.zeros_like(fases[0]), fases[0]]),
+        forma, pares=[(0, 0), (1, 1)])
 
     # --- 4. Experimento B: O Transplante (Troca de Fase) ---
+    # Todas as combinações de uma vez: trocas[i, j] = Mag(i) + Fase(j)
+    trocas = reconstruir_lote(magnitudes, fases, forma)
     # Mag da Imagem 1 + Fase da Imagem 2
-    rec_mista_12 = reconstruir(mag1, fase2)
-    
+    rec_mista_12 = trocas[0, 1]
     # Mag da Imagem 2 + Fase da Imagem 1
-    rec_mista_21 = reconstruir(mag2, fase1)
+    rec_mista_21 = trocas[1, 0]
 
     # --- 5. Visualização ---
-    plt.figure(figsize=(12, 10))
-
-    # Linha 1: Isolamento da Imagem 1
-    plt.subplot(3, 3, 1)
-    plt.imshow(img1, cmap='gray')
-    plt.title('Original 1')
-    plt.axis('off')
-
-    plt.subplot(3, 3, 2)
-    plt.imshow(np.log(rec_so_mag1 + 1), cmap='gray') 
-    plt.title('Apenas Magnitude 1\n(Sem forma definida)')
-    plt.axis('off')
-
-    plt.subplot(3, 3, 3)
-    plt.imshow(rec_so_fase1, cmap='gray')
-    plt.title('Apenas Fase 1\n(Bordas visíveis!)')
-    plt.axis('off')
-
-    # Linha 2: Imagens Originais para Comparação do Transplante
-    plt.subplot(3, 3, 4)
-    plt.imshow(img1, cmap='gray')
-    plt.title('Fonte Mag (Img 1)')
-    plt.axis('off')
-    
-    plt.subplot(3, 3, 5)
-    plt.title('--- MISTURA ---')
-    plt.axis('off')
-
-    plt.subplot(3, 3, 6)
-    plt.imshow(img2, cmap='gray')
-    plt.title('Fonte Fase (Img 2)')
-    plt.axis('off')
-
-    # Linha 3: O Resultado da Troca
-    plt.subplot(3, 3, 7)
-    plt.imshow(rec_mista_12, cmap='gray')
-    plt.title('Mag(1) + Fase(2)\n(Parece a Imagem 2!)')
-    plt.axis('off')
-
-    plt.subplot(3, 3, 9)
-    plt.imshow(rec_mista_21, cmap='gray')
-    plt.title('Mag(2) + Fase(1)\n(Parece a Imagem 1!)')
-    plt.axis('off')
-
-    plt.tight_layout()
-    plt.show()
+    paineis = [
+        # Linha 1: Isolamento da Imagem 1
+        montagem.painel(img1, 'Original 1'),
+        montagem.painel(np.log(rec_so_mag1 + 1), 'Apenas Magnitude 1\n(Sem forma definida)'),
+        montagem.painel(rec_so_fase1, 'Apenas Fase 1\n(Bordas visíveis!)'),
+        # Linha 2: Imagens Originais para Comparação do Transplante
+        montagem.painel(img1, 'Fonte Mag (Img 1)'),
+        montagem.painel(None, '--- MISTURA ---'),
+        montagem.painel(img2, 'Fonte Fase (Img 2)'),
+        # Linha 3: O Resultado da Troca
+        montagem.painel(rec_mista_12, 'Mag(1) + Fase(2)\n(Parece a Imagem 2!)'),
+        None,
+        montagem.painel(rec_mista_21, 'Mag(2) + Fase(1)\n(Parece a Imagem 1!)'),
+    ]
+    if saida:
+        montagem.salvar(saida, paineis, colunas=3)
+    else:
+        montagem.mostrar(paineis, colunas=3, figsize=(12, 10))
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,17 +1,19 @@
 import cv2
 import numpy as np
-import matplotlib.pyplot as plt
 
+import espectro
+from cache import memoizar
+from convolucao import convoluir_auto
+
+@memoizar
 def calcular_fft(imagem):
     """
     Calcula a Transformada de Fourier (FFT) 2D.
     """
-    f = np.fft.fft2(imagem)
-    fshift = np.fft.fftshift(f)
     # Soma +1 para evitar log(0)
-    magnitude_spectrum = 20 * np.log(np.abs(fshift) + 1)
-    return magnitude_spectrum
+    return espectro.calcular_espectro(imagem, precisao=np.float32, epsilon=1)
 
+@memoizar
 def aplicar_filtro_sobel(imagem_gray):
     """Aplica Sobel (Passa-Altas/Bordas)."""
     sobelx = cv2.Sobel(imagem_gray, cv2.CV_64F, 1, 0, ksize=3)
@@ -20,16 +22,28 @@ def aplicar_filtro_sobel(imagem_gray):
     magnitude = np.uint8(255 * magnitude / np.max(magnitude))
     return magnitude
 
-def aplicar_filtro_passa_baixa(imagem_gray):
+@memoizar
+def aplicar_filtro_passa_baixa(imagem_gray, tamanho=25):
     """
     Aplica um Filtro Gaussiano Forte (Passa-Baixas/Blur).
     Isso elimina detalhes finos e deixa apenas as formas "grosseiras".
+
+    Pode diferir de cv2.GaussianBlur(imagem, (tamanho, tamanho), 0) em até
+    2 níveis: no uint8 o GaussianBlur usa um kernel em ponto fixo, aqui o
+    kernel é float e só o resultado é arredondado (fica a <= 1 nível do
+    borrão exato em float64). Em troca, kernels grandes saem bem mais
+    rápidos (101x101 em 2000x1500: ~40 ms contra ~100 ms do GaussianBlur).
     """
-    # Kernel (25, 25) é bem grande para deixar o efeito óbvio
-    img_blur = cv2.GaussianBlur(imagem_gray, (25, 25), 0)
+    # Kernel (25, 25) é bem grande para deixar o efeito óbvio.
+    # Para kernels MUITO grandes, convoluir_auto troca sozinho para a FFT.
+    gauss = cv2.getGaussianKernel(tamanho, 0)
+    kernel = gauss * gauss.T
+    img_blur = convoluir_auto(imagem_gray, -1, kernel)
     return img_blur
 
 def main():
+    import matplotlib.pyplot as plt
+
     # --- 1. Carregamento ---
     # Substitua pelo caminho da sua imagem
     caminho_imagem = r'circulo_anel.jpg' 
@@ -0,0 +1,165 @@
+import functools
+
+import cv2
+import numpy as np
+
+import espectro
+
+TIPOS = ("passa_baixa", "passa_alta", "passa_banda", "rejeita_banda", "rejeita_notch", "passa_notch")
+FAMILIAS = ("ideal", "butterworth", "gaussiano")
+
+
+def _grade_frequencias(forma):
+    """
+    Coordenadas (u, v) de cada posição do espectro da rfft2 (sem fftshift),
+    em "ciclos por imagem": u vai de -H/2 a H/2, v de 0 a W/2.
+    """
+    altura, largura = forma
+    u = (np.fft.fftfreq(altura) * altura).astype(np.float32)[:, None]
+    v = (np.fft.rfftfreq(largura) * largura).astype(np.float32)[None, :]
+    return u, v
+
+
+def _passa_baixa(distancia, familia, corte, ordem):
+    if familia == "ideal":
+        return (distancia <= corte).astype(np.float32)
+    if familia == "butterworth":
+        return 1 / (1 + (distancia / corte) ** (2 * ordem))
+    return np.exp(-(distancia ** 2) / (2 * corte ** 2))
+
+
+def _rejeita_banda(distancia, familia, corte, ordem, largura):
+    # 'corte' é o raio central da banda e 'largura' a sua espessura
+    if familia == "ideal":
+        return (np.abs(distancia - corte) > largura / 2).astype(np.float32)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if familia == "butterworth":
+            razao = distancia * largura / (distancia ** 2 - corte ** 2)
+            resposta = 1 / (1 + razao ** (2 * ordem))
+        else:
+            razao = (distancia ** 2 - corte ** 2) / (distancia * largura)
+            resposta = 1 - np.exp(-(razao ** 2))
+    # Em D = corte (Butterworth) ou D = 0 (Gaussiano) a divisão é 0/0
+    return np.nan_to_num(resposta, nan=0.0 if familia == "butterworth" else 1.0)
+
+
+def _rejeita_notch(u, v, forma, familia, corte, ordem, centros):
+    altura, largura = forma
+    resposta = np.ones(np.broadcast_shapes(u.shape, v.shape), dtype=np.float32)
+    for cu, cv in centros:
+        # Cada notch tem o seu simétrico (-u, -v): o espectro de imagem real é simétrico.
+        # As distâncias são periódicas (o espectro "dá a volta" nas bordas).
+        for su, sv in ((cu, cv), (-cu, -cv)):
+            du = (u - su + altura / 2) % altura - altura / 2
+            dv = (v - sv + largura / 2) % largura - largura / 2
+            distancia = np.sqrt(du ** 2 + dv ** 2)
+            resposta *= 1 - _passa_baixa(distancia, familia, corte, ordem)
+    return resposta
+
+
+@functools.lru_cache(maxsize=64)
+def _mascara_cache(forma, tipo, familia, corte, ordem, largura, centros):
+    u, v = _grade_frequencias(forma)
+
+    if tipo in ("rejeita_notch", "passa_notch"):
+        mascara = _rejeita_notch(u, v, forma, familia, corte, ordem, centros)
+        if tipo == "passa_notch":
+            mascara = 1 - mascara
+    else:
+        distancia = np.sqrt(u ** 2 + v ** 2)
+        if tipo == "passa_baixa":
+            mascara = _passa_baixa(distancia, familia, corte, ordem)
+        elif tipo == "passa_alta":
+            mascara = 1 - _passa_baixa(distancia, familia, corte, ordem)
+        elif tipo == "rejeita_banda":
+            mascara = _rejeita_banda(distancia, familia, corte, ordem, largura)
+        else:
+            mascara = 1 - _rejeita_banda(distancia, familia, corte, ordem, largura)
+
+    mascara = np.ascontiguousarray(mascara, dtype=np.float32)
+    mascara.setflags(write=False)  # Compartilhada pelo cache: somente leitura
+    return mascara
+
+
+def criar_mascara(forma, tipo="passa_baixa", familia="gaussiano", corte=30, ordem=2, largura=10, centros=()):
+    """
+    Função de transferência H(u, v) no formato do espectro da rfft2: (H, W//2 + 1).
+
+    - tipo: passa_baixa, passa_alta, passa_banda, rejeita_banda, rejeita_notch, passa_notch
+    - familia: ideal, butterworth ou gaussiano
+    - corte: raio de corte (ou raio central da banda / raio de cada notch)
+    - ordem: ordem do Butterworth
+    - largura: espessura da banda
+    - centros: lista de (u, v) dos notches, em ciclos por imagem
+
+    Cada combinação de (forma, parâmetros) é calculada UMA vez e fica em cache.
+    """
+    if tipo not in TIPOS:
+        raise ValueError(f"Tipo '{tipo}' inválido. Use um de {TIPOS}.")
+    if familia not in FAMILIAS:
+        raise ValueError(f"Família '{familia}' inválida. Use uma de {FAMILIAS}.")
+    centros = tuple((float(cu), float(cv)) for cu, cv in centros)
+    forma = (int(forma[0]), int(forma[1]))
+    return _mascara_cache(forma, tipo, familia, float(corte), int(ordem), float(largura), centros)
+
+
+def mascara_centralizada(mascara, largura):
+    """Máscara completa (H, W) com a frequência zero no centro, para visualização."""
+    return espectro.expandir_espectro(mascara, largura)
+
+
+def filtrar(imagens, mascara=None, workers=None, **parametros):
+    """
+    Filtra no domínio da frequência: irfft2(rfft2(imagem) * H).
+
+    'imagens' pode ser uma imagem (H, W) ou um lote (N, H, W): todas
+    compartilham a mesma máscara (broadcast), calculada uma vez só.
+    Se 'mascara' não for dada, ela é criada com os 'parametros'
+    (tipo, familia, corte, ...) de criar_mascara.
+    Retorna float32 (filtros passa-altas geram valores negativos).
+    """
+    dados = np.asarray(imagens, dtype=np.float32)
+    forma = dados.shape[-2:]
+    if mascara is None:
+        mascara = criar_mascara(forma, **parametros)
+    elif mascara.shape != (forma[0], forma[1] // 2 + 1):
+        raise ValueError(f"Máscara {mascara.shape} não corresponde a imagens {forma}.")
+
+    espectro_imagens = espectro.rfft2(dados, workers=workers)
+    espectro_imagens *= mascara
+    return espectro.irfft2(espectro_imagens, forma, workers=workers)
+
+
+def main():
+    import matplotlib.pyplot as plt
+
+    img = cv2.imread('circulo_anel.jpg', cv2.IMREAD_GRAYSCALE)
+    if img is None:
+        print("Criando imagem sintética (Retângulo)...")
+        img = np.zeros((300, 300), dtype=np.uint8)
+        cv2.rectangle(img, (50, 100), (250, 200), 255, -1)
+
+    # As três famílias de passa-baixa com o mesmo corte, filtradas em UM lote
+    familias = ["ideal", "butterworth", "gaussiano"]
+    mascaras = [criar_mascara(img.shape, "passa_baixa", f, corte=20) for f in familias]
+    lote = np.stack([img, img, img])
+    resultados = espectro.irfft2(espectro.rfft2(lote.astype(np.float32)) * np.stack(mascaras), img.shape)
+
+    plt.figure(figsize=(12, 8))
+    for i, (familia, mascara, resultado) in enumerate(zip(familias, mascaras, resultados)):
+        plt.subplot(2, 3, i + 1)
+        plt.imshow(mascara_centralizada(mascara, img.shape[1]), cmap='gray')
+        plt.title(f"Máscara {familia}")
+        plt.axis('off')
+
+        plt.subplot(2, 3, i + 4)
+        plt.imshow(resultado, cmap='gray')
+        plt.title("Resultado\n(o ideal gera 'ringing')" if familia == "ideal" else "Resultado")
+        plt.axis('off')
+
+    plt.tight_layout()
+    plt.show()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,12 @@
 import cv2
 import numpy as np
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
+
+import ruido
 
 def main():
+    import matplotlib.pyplot as plt
+    from mpl_toolkits.mplot3d import Axes3D  # Registra a projeção '3d' (matplotlib antigo)
+
     # --- 1. VISUALIZAR O KERNEL 3D (O SINO) ---
     
     # Criar um kernel Gaussiano 15x15 com Sigma 3
@@ -32,9 +35,8 @@ def main():
     img = np.zeros((200, 200), dtype=np.uint8)
     cv2.rectangle(img, (50, 50), (150, 150), 255, -1)
     # Adicionar ruído "Sal e Pimenta"
-    ruido = np.random.randint(0, 100, (200, 200))
-    img = np.where(ruido < 5, 0, img)   # Pontos pretos
-    img = np.where(ruido > 95, 255, img) # Pontos brancos
+    # ~5% de pontos pretos e ~4% de brancos (a proporção do sorteio antigo)
+    ruido.sal_pimenta(img, quantidade=0.09, proporcao_sal=4 / 9)
 
     # Aplicar Filtro de Média (Box Blur)
     # Tamanho 9x9
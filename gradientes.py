@@ -0,0 +1,111 @@
+import cv2
+import numpy as np
+
+# Kernels de Prewitt (pesos iguais: 1, 1, 1)
+KERNEL_PREWITT_X = np.array([[-1, 0, 1],
+                             [-1, 0, 1],
+                             [-1, 0, 1]], dtype=np.float32)
+
+KERNEL_PREWITT_Y = np.array([[-1, -1, -1],
+                             [ 0,  0,  0],
+                             [ 1,  1,  1]], dtype=np.float32)
+
+
+class EspacoTrabalho:
+    """
+    Buffers reutilizáveis para UMA resolução de imagem.
+    Crie uma vez (ex.: antes do loop de vídeo) e passe para as funções
+    abaixo: nenhum array do tamanho do quadro é alocado por chamada.
+    """
+
+    def __init__(self, forma, dtype=np.float32):
+        self.forma = tuple(forma[:2])
+        self.dtype = np.dtype(dtype)
+        self.gx = np.empty(self.forma, dtype=self.dtype)
+        self.gy = np.empty(self.forma, dtype=self.dtype)
+        self.magnitude = np.empty(self.forma, dtype=self.dtype)
+        self.normalizada = np.empty(self.forma, dtype=np.uint8)
+
+    def compativel(self, imagem):
+        return imagem.shape[:2] == self.forma
+
+
+def _profundidade(buffer):
+    return cv2.CV_64F if buffer.dtype == np.float64 else cv2.CV_32F
+
+
+def _buffers_gradiente(imagem, out):
+    if out is None:
+        return np.empty(imagem.shape, np.float32), np.empty(imagem.shape, np.float32)
+    return out
+
+
+def sobel(imagem, out=None, ksize=3):
+    """Gradientes de Sobel (gx, gy). 'out' = (gx, gy) já alocados (float32/float64)."""
+    gx, gy = _buffers_gradiente(imagem, out)
+    cv2.Sobel(imagem, _profundidade(gx), 1, 0, dst=gx, ksize=ksize)
+    cv2.Sobel(imagem, _profundidade(gy), 0, 1, dst=gy, ksize=ksize)
+    return gx, gy
+
+
+def prewitt(imagem, out=None):
+    """Gradientes de Prewitt (gx, gy) via filter2D. 'out' = (gx, gy) já alocados."""
+    gx, gy = _buffers_gradiente(imagem, out)
+    cv2.filter2D(imagem, _profundidade(gx), KERNEL_PREWITT_X, dst=gx)
+    cv2.filter2D(imagem, _profundidade(gy), KERNEL_PREWITT_Y, dst=gy)
+    return gx, gy
+
+
+def magnitude(gx, gy, out=None):
+    """sqrt(gx^2 + gy^2) escrito em 'out' (pode ser o próprio gx)."""
+    if out is None:
+        out = np.empty_like(gx)
+    cv2.magnitude(gx, gy, magnitude=out)
+    return out
+
+
+def normalizar(magnitude_float, out=None):
+    """
+    Mesmo resultado de np.uint8(255 * m / np.max(m)), mas sem temporários:
+    a escala é feita IN-PLACE em 'magnitude_float' (que é sobrescrito).
+    """
+    if out is None:
+        out = np.empty(magnitude_float.shape, dtype=np.uint8)
+
+    maximo = magnitude_float.max()
+    if maximo == 0:
+        out.fill(0)
+        return out
+
+    np.multiply(magnitude_float, 255, out=magnitude_float)
+    np.divide(magnitude_float, maximo, out=magnitude_float)
+    np.copyto(out, magnitude_float, casting="unsafe")  # Trunca como np.uint8(...)
+    return out
+
+
+def _bordas(imagem, espaco, operador):
+    if espaco is None:
+        espaco = EspacoTrabalho(imagem.shape)
+    elif not espaco.compativel(imagem):
+        raise ValueError(f"Espaço de trabalho {espaco.forma} não serve para imagem {imagem.shape[:2]}.")
+
+    operador(imagem, out=(espaco.gx, espaco.gy))
+    magnitude(espaco.gx, espaco.gy, out=espaco.magnitude)
+    return normalizar(espaco.magnitude, out=espaco.normalizada)
+
+
+def bordas_sobel(imagem, espaco=None):
+    """
+    main.aplicar_filtro_sobel usando o espaço de trabalho. Com o espaço
+    float32 padrão o resultado bate com o do main (float64) a menos de
+    ±1 nível em alguns pixels (arredondamento antes do corte para uint8);
+    um EspacoTrabalho(forma, np.float64) dá o mesmo resultado exato.
+    O resultado é 'espaco.normalizada': copie se precisar guardá-lo
+    depois da próxima chamada.
+    """
+    return _bordas(imagem, espaco, sobel)
+
+
+def bordas_prewitt(imagem, espaco=None):
+    """Magnitude de Prewitt normalizada para 0-255, usando o espaço de trabalho."""
+    return _bordas(imagem, espaco, prewitt)
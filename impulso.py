@@ -1,74 +1,67 @@
 import cv2
 import numpy as np
-import matplotlib.pyplot as plt
 
-def gerar_espectro(imagem):
-    """Gera o espectro de frequência centralizado e logarítmico"""
-    f = np.fft.fft2(imagem)
-    fshift = np.fft.fftshift(f)
-    magnitude = 20 * np.log(np.abs(fshift) + 1e-5) # +1e-5 evita log(0)
-    return magnitude
+import montagem
+import resposta_frequencia
 
-def main():
-    # 1. CRIAR O IMPULSO (Delta de Dirac)
+def main(saida=None):
+    """Mostra as respostas numa janela ou, se 'saida' for dada, grava o PNG."""
+    # 1. GRADE DA RESPOSTA (64x64)
+    # A resposta ao impulso de um kernel é o próprio kernel (espelhado) na grade:
+    # não precisamos criar o impulso e passar o filter2D nele
     tamanho = 64 # Imagem 64x64
-    impulso = np.zeros((tamanho, tamanho), dtype=np.float32)
-    
-    # Coloca um único pixel branco (valor 1.0) EXATAMENTE no centro
-    centro = tamanho // 2
-    impulso[centro, centro] = 1.0
+    forma = (tamanho, tamanho)
 
     # Definindo Kernels Manuais para teste
-    
+
     # A. Média (Box Blur) - Suaviza tudo
     k_media = np.ones((5, 5), np.float32) / 25
-    
+
     # B. Gaussiano - Suaviza suavemente (redondo)
     # Usamos uma função do OpenCV para gerar a matriz 5x5
     k_gauss = cv2.getGaussianKernel(5, -1)
     k_gauss = k_gauss * k_gauss.T # Torna 2D
-    
+
     # C. Laplaciano (Bordas em todas as direções) - Passa-Altas
     k_laplace = np.array([[0, 1, 0],
                           [1, -4, 1],
                           [0, 1, 0]], dtype=np.float32)
 
-    # Lista de filtros para iterar
+    # Lista de filtros: (nome, kernel, resposta analítica para conferir)
+    # O "kernel" do impulso original é o [[1]] (identidade)
     filtros = [
-        ("Impulso Original", None), # Caso base
-        ("Filtro Média (Passa-Baixa)", k_media),
-        ("Filtro Gaussiano (Passa-Baixa)", k_gauss),
-        ("Laplaciano (Passa-Altas)", k_laplace)
+        ("Impulso Original", np.ones((1, 1)), None), # Caso base
+        ("Filtro Média (Passa-Baixa)", k_media, resposta_frequencia.resposta_media(5, forma)),
+        # getGaussianKernel(5, -1) usa sigma = 1.1; a analítica é a Gaussiana contínua
+        ("Filtro Gaussiano (Passa-Baixa)", k_gauss, resposta_frequencia.resposta_gaussiana(1.1, forma)),
+        ("Laplaciano (Passa-Altas)", k_laplace, resposta_frequencia.resposta_laplaciano(4, forma)),
     ]
 
-    plt.figure(figsize=(10, 12))
+    # 2. TODAS AS FUNÇÕES DE TRANSFERÊNCIA DE UMA VEZ (uma rfft2 em lote)
+    transferencias = resposta_frequencia.transferencias([kernel for _, kernel, _ in filtros], forma)
+    # +1e-5 evita log(0)
+    espectros = resposta_frequencia.espectro_log(transferencias, tamanho, epsilon=1e-5)
 
-    for i, (nome, kernel) in enumerate(filtros):
-        # Processamento
-        if kernel is None:
-            resultado_espacial = impulso
-        else:
-            # Aplica a convolução do kernel no impulso
-            resultado_espacial = cv2.filter2D(impulso, -1, kernel)
-            
-        # Cálculo da Frequência (FFT)
-        espectro = gerar_espectro(resultado_espacial)
+    paineis = []
+    for (nome, kernel, analitica), transferencia, espectro_log in zip(filtros, transferencias, espectros):
+        if analitica is not None:
+            erro = np.abs(np.abs(transferencia) - np.abs(analitica)).max()
+            print(f"{nome:32s} | diferença máx. para a resposta analítica: {erro:.2e}")
+
+        # Espacial: o kernel centralizado (o que o filter2D faria no impulso do centro)
+        resultado_espacial = np.fft.fftshift(resposta_frequencia.posicionar(kernel, forma))
 
         # --- PLOTAGEM ---
         # Coluna da Esquerda: Domínio do Espaço (O desenho do filtro)
-        plt.subplot(4, 2, i*2 + 1)
-        plt.imshow(resultado_espacial, cmap='gray')
-        plt.title(f"{nome} - Espacial")
-        plt.axis('off')
-        
+        paineis.append(montagem.painel(resultado_espacial, f"{nome} - Espacial"))
+
         # Coluna da Direita: Domínio da Frequência (O que ele deixa passar)
-        plt.subplot(4, 2, i*2 + 2)
-        plt.imshow(espectro, cmap='inferno')
-        plt.title(f"Espectro de Frequência")
-        plt.axis('off')
+        paineis.append(montagem.painel(espectro_log, "Espectro de Frequência", cmap='inferno'))
 
-    plt.tight_layout()
-    plt.show()
+    if saida:
+        montagem.salvar(saida, paineis, colunas=2)
+    else:
+        montagem.mostrar(paineis, colunas=2, figsize=(10, 12))
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,8 +1,9 @@
 import cv2
 import numpy as np
-import matplotlib.pyplot as plt
 
 def main():
+    import matplotlib.pyplot as plt
+
     # --- PARTE 1: ENTENDENDO O SOBEL E A SETA ---
     
     # Criar uma imagem preta 200x200
@@ -0,0 +1,11 @@
+"""
+Importe antes dos módulos da raiz do projeto (convolucao, gradientes,
+ruido, ...): põe a pasta de cima no sys.path uma vez só, para os scripts
+desta pasta rodarem direto (python sobel.py) ou importados de fora.
+"""
+import os
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.append(RAIZ)
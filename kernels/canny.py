@@ -1,61 +1,150 @@
 import cv2
 import numpy as np
 import os
+import time
 
-def nada(x):
-    # Função de callback necessária para o trackbar
-    pass
+def tamanho_kernel_impar(blur_val):
+    # O kernel do GaussianBlur DEVE ser um número ímpar (1, 3, 5, etc.)
+    # Se o valor for par, soma 1 para torná-lo ímpar. Se for 0, vira 1.
+    kernel_size = blur_val if blur_val % 2 == 1 else blur_val + 1
+    if kernel_size < 1: kernel_size = 1 # Garante que seja pelo menos 1
+    return kernel_size
 
-# 1. Carregar a imagem em escala de cinza
-# Substitua 'sua_imagem.png' pelo caminho do seu arquivo
-caminho_imagem = f"{os.path.dirname(__file__)}/image.png"
-imagem = cv2.imread(caminho_imagem, 0)
+# Acima deste número de pixels, o arraste das barras usa uma prévia reduzida
+PIXELS_PREVIA = 1_000_000
+# Tempo (s) sem mexer nas barras para considerar que o usuário "soltou"
+TEMPO_ASSENTAMENTO = 0.25
 
-if imagem is None:
-    print("Erro: Imagem não encontrada! Verifique o nome do arquivo.")
-    exit()
+def construir_piramide(imagem, pixels_max=PIXELS_PREVIA):
+    """
+    Níveis da pirâmide Gaussiana (cada um com metade do lado do anterior),
+    calculados UMA vez no carregamento, até caber em 'pixels_max'.
+    """
+    niveis = [imagem]
+    while niveis[-1].size > pixels_max and min(niveis[-1].shape[:2]) > 1:
+        niveis.append(cv2.pyrDown(niveis[-1]))
+    return niveis
 
-# 2. Criar uma janela nomeada
-nome_janela = 'Ajuste Fino: Blur + Canny'
-cv2.namedWindow(nome_janela)
+class AjusteCanny:
+    """
+    Recalcula Blur + Canny SÓ quando alguma barra muda de valor.
+    - A imagem borrada fica em cache por tamanho de kernel: mexer apenas
+      nos limiares reaproveita o blur e paga só o Canny.
+    - Em imagens grandes, enquanto o usuário arrasta, o cálculo roda no
+      nível reduzido da pirâmide (prévia); quando ele para de mexer,
+      a resolução completa é renderizada.
+    - O tempo de cada atualização é mostrado na própria janela.
+    """
 
-# 3. Criar as barras deslizantes (Trackbars)
-# Trackbar para o Blur (valores ímpares apenas: 1, 3, 5...)
-cv2.createTrackbar('Blur (Desfoque)', nome_janela, 1, 15, nada)
-# Trackbars para os Limiares do Canny
-cv2.createTrackbar('Min Threshold', nome_janela, 50, 500, nada)
-cv2.createTrackbar('Max Threshold', nome_janela, 150, 500, nada)
+    def __init__(self, imagem, nome_janela):
+        self.niveis = construir_piramide(imagem)
+        self.nivel_previa = len(self.niveis) - 1
+        self.nome_janela = nome_janela
+        self.cache_blur = {}
+        self.ultimos_parametros = None
+        self.ultima_mudanca = 0.0
+        self.completo_pendente = False
+        self.pronto = False # Só lê as barras depois que todas existirem
 
-print("Ajuste as barras. O valor do Blur será sempre ímpar. Pressione 'ESC' para sair.")
+    def ler_parametros(self):
+        blur_val = cv2.getTrackbarPos('Blur (Desfoque)', self.nome_janela)
+        min_val = cv2.getTrackbarPos('Min Threshold', self.nome_janela)
+        max_val = cv2.getTrackbarPos('Max Threshold', self.nome_janela)
+        return tamanho_kernel_impar(blur_val), min_val, max_val
 
-while True:
-    # 4. Ler as posições atuais das barras
-    blur_val = cv2.getTrackbarPos('Blur (Desfoque)', nome_janela)
-    min_val = cv2.getTrackbarPos('Min Threshold', nome_janela)
-    max_val = cv2.getTrackbarPos('Max Threshold', nome_janela)
+    def imagem_borrada(self, nivel, kernel_size):
+        # Passo Crucial: Aplicar o Desfoque Gaussiano ANTES do Canny
+        # Isso remove o ruído e a textura fina
+        chave = (nivel, kernel_size)
+        if chave not in self.cache_blur:
+            self.cache_blur[chave] = cv2.GaussianBlur(self.niveis[nivel], (kernel_size, kernel_size), 0)
+        return self.cache_blur[chave]
 
-    # O kernel do GaussianBlur DEVE ser um número ímpar (1, 3, 5, etc.)
-    # Se o valor for par, soma 1 para torná-lo ímpar. Se for 0, vira 1.
-    kernel_size = blur_val if blur_val % 2 == 1 else blur_val + 1
-    if kernel_size < 1: kernel_size = 1 # Garante que seja pelo menos 1
+    def renderizar(self, nivel):
+        kernel_size, min_val, max_val = self.ultimos_parametros
+        # No nível n a imagem é 2^n vezes menor: o kernel encolhe junto
+        kernel_nivel = tamanho_kernel_impar(round(kernel_size / 2**nivel))
+
+        inicio = time.perf_counter()
+        imagem_borrada = self.imagem_borrada(nivel, kernel_nivel)
+
+        # Aplicar o Canny na imagem JÁ borrada
+        bordas = cv2.Canny(imagem_borrada, min_val, max_val)
+        latencia_ms = (time.perf_counter() - inicio) * 1000
+
+        # Mostrar o valor real do kernel do blur e o tempo da atualização
+        modo = 'Completo' if nivel == 0 else f'Previa 1/{2**nivel}'
+        escala = max(0.7, bordas.shape[1] / 1000)
+        espessura = max(2, int(escala * 2))
+        cv2.putText(bordas, f'Kernel Blur: {kernel_size}x{kernel_size}', (10, int(30 * escala)),
+                    cv2.FONT_HERSHEY_SIMPLEX, escala, (255, 255, 255), espessura)
+        cv2.putText(bordas, f'Latencia: {latencia_ms:.1f} ms ({modo})', (10, int(60 * escala)),
+                    cv2.FONT_HERSHEY_SIMPLEX, escala, (255, 255, 255), espessura)
+
+        cv2.imshow(self.nome_janela, bordas)
+
+    def atualizar(self, _=None):
+        """Callback das barras: só trabalha se os parâmetros mudaram."""
+        if not self.pronto:
+            return
+        parametros = self.ler_parametros()
+        if parametros == self.ultimos_parametros:
+            return
+        self.ultimos_parametros = parametros
+        self.ultima_mudanca = time.perf_counter()
+
+        # Durante o arraste mostra a prévia; a versão completa fica pendente
+        self.renderizar(self.nivel_previa)
+        self.completo_pendente = self.nivel_previa > 0
+
+    def verificar_assentamento(self):
+        """Chamado no loop: renderiza a resolução completa quando as barras param."""
+        if self.completo_pendente and time.perf_counter() - self.ultima_mudanca > TEMPO_ASSENTAMENTO:
+            self.completo_pendente = False
+            self.renderizar(0)
+
+def main():
+    # 1. Carregar a imagem em escala de cinza
+    # Substitua 'sua_imagem.png' pelo caminho do seu arquivo
+    caminho_imagem = f"{os.path.dirname(__file__)}/image.png"
+    imagem = cv2.imread(caminho_imagem, 0)
+
+    if imagem is None:
+        print("Erro: Imagem não encontrada! Verifique o nome do arquivo.")
+        return
 
-    # 5. Passo Crucial: Aplicar o Desfoque Gaussiano ANTES do Canny
-    # Isso remove o ruído e a textura fina
-    imagem_borrada = cv2.GaussianBlur(imagem, (kernel_size, kernel_size), 0)
+    # 2. Criar uma janela nomeada
+    nome_janela = 'Ajuste Fino: Blur + Canny'
+    # WINDOW_NORMAL: a janela escala a imagem, então prévia e completa ocupam o mesmo espaço
+    cv2.namedWindow(nome_janela, cv2.WINDOW_NORMAL)
+    ajuste = AjusteCanny(imagem, nome_janela)
 
-    # 6. Aplicar o Canny na imagem JÁ borrada
-    bordas = cv2.Canny(imagem_borrada, min_val, max_val)
+    # 3. Criar as barras deslizantes (Trackbars)
+    # Cada mudança chama ajuste.atualizar (orientado a eventos, sem polling)
+    # Trackbar para o Blur (valores ímpares apenas: 1, 3, 5...)
+    cv2.createTrackbar('Blur (Desfoque)', nome_janela, 1, 15, ajuste.atualizar)
+    # Trackbars para os Limiares do Canny
+    cv2.createTrackbar('Min Threshold', nome_janela, 50, 500, ajuste.atualizar)
+    cv2.createTrackbar('Max Threshold', nome_janela, 150, 500, ajuste.atualizar)
 
-    # Opcional: Mostrar o valor real do kernel do blur na imagem
-    cv2.putText(bordas, f'Kernel Blur: {kernel_size}x{kernel_size}', (10, 30), 
-                cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+    print("Ajuste as barras. O valor do Blur será sempre ímpar. Pressione 'ESC' para sair.")
+    ajuste.pronto = True
+    ajuste.atualizar()
 
-    # 7. Mostrar o resultado
-    cv2.imshow(nome_janela, bordas)
+    while True:
+        # Espera eventos em vez de girar a 100% de CPU: o desenho
+        # acontece nos callbacks, aqui só tratamos o teclado e a
+        # renderização completa depois que o usuário solta as barras
+        k = cv2.waitKey(30) & 0xFF
+        ajuste.verificar_assentamento()
+        # Pressione ESC (código 27) para fechar
+        if k == 27:
+            break
+        # Fechou a janela pelo "X"
+        if cv2.getWindowProperty(nome_janela, cv2.WND_PROP_VISIBLE) < 1:
+            break
 
-    # Pressione ESC (código 27) para fechar
-    k = cv2.waitKey(1) & 0xFF
-    if k == 27:
-        break
+    cv2.destroyAllWindows()
 
-cv2.destroyAllWindows()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+import argparse
+import time
+
+import numpy as np
+
+# Catálogo de "verdade" (ground truth): uma linha por estrela gerada
+CATALOGO_REAL_DTYPE = np.dtype([('x', np.float32), ('y', np.float32),
+                                ('fluxo', np.float32), ('sigma', np.float32)])
+
+# Pixels de "selo" (estrelas x (2r+1)²) somados por vez: limita os
+# temporários float64 a ~100 MB qualquer que seja o sigma máximo
+PIXELS_POR_BLOCO = 8_000_000
+
+
+def sortear_catalogo(largura, altura, num_estrelas, rng, sigma=(0.7, 1.5),
+                     fluxo=(500.0, 5000.0), margem=0):
+    """
+    Sorteia posições (sub-pixel), fluxos e larguras de PSF de todas as estrelas
+    de uma vez. O fluxo é log-uniforme: muitas estrelas fracas, poucas fortes.
+    """
+    catalogo = np.empty(num_estrelas, dtype=CATALOGO_REAL_DTYPE)
+    catalogo['x'] = rng.uniform(margem, largura - 1 - margem, num_estrelas)
+    catalogo['y'] = rng.uniform(margem, altura - 1 - margem, num_estrelas)
+    catalogo['fluxo'] = np.exp(rng.uniform(np.log(fluxo[0]), np.log(fluxo[1]), num_estrelas))
+    catalogo['sigma'] = rng.uniform(sigma[0], sigma[1], num_estrelas)
+    return catalogo
+
+
+def _criar_saida(saida, forma, dtype):
+    if saida is None:
+        return np.empty(forma, dtype=dtype)
+    if isinstance(saida, str):
+        # Caminho: cria um .npy mapeado em memória (frames maiores que a RAM)
+        return np.lib.format.open_memmap(saida, mode="w+", dtype=dtype, shape=forma)
+    return saida
+
+
+def _somar_estrelas(faixa, estrelas, y0, pixels_por_bloco):
+    """Soma as PSFs Gaussianas das estrelas na faixa (vetorizado, em blocos)."""
+    altura_faixa, largura = faixa.shape
+    raio = int(np.ceil(4 * estrelas['sigma'].max()))
+    deslocamento = np.arange(-raio, raio + 1, dtype=np.float32)
+    # O selo cresce com sigma²: o bloco tem menos estrelas quando elas são largas
+    estrelas_por_bloco = max(1, pixels_por_bloco // (2 * raio + 1)**2)
+
+    acumulado = np.zeros(faixa.size, dtype=np.float64)
+    for inicio in range(0, len(estrelas), estrelas_por_bloco):
+        bloco = estrelas[inicio:inicio + estrelas_por_bloco]
+        x0 = np.floor(bloco['x'])
+        y0_estrela = np.floor(bloco['y'])
+        sigma = bloco['sigma'][:, None]
+
+        # A PSF Gaussiana é separável: exp(-(dx²+dy²)/2σ²) = perfil_x * perfil_y.
+        # Só 2*(2r+1) exponenciais por estrela em vez de (2r+1)².
+        perfil_x = np.exp(-((x0 - bloco['x'])[:, None] + deslocamento)**2 / (2 * sigma**2))
+        perfil_y = np.exp(-((y0_estrela - bloco['y'])[:, None] + deslocamento)**2 / (2 * sigma**2))
+        perfil_y *= bloco['fluxo'][:, None] / (2 * np.pi * sigma**2)
+        valores = perfil_y[:, :, None] * perfil_x[:, None, :]
+
+        # Coordenadas de cada pixel do "selo" (n_estrelas x linhas x colunas)
+        px = (x0.astype(np.int32)[:, None] + deslocamento.astype(np.int32))[:, None, :]
+        py = (y0_estrela.astype(np.int32)[:, None] + deslocamento.astype(np.int32))[:, :, None]
+
+        # Só o que cai dentro da faixa/imagem; bincount soma as sobreposições
+        dentro = (px >= 0) & (px < largura) & (py >= y0) & (py < y0 + altura_faixa)
+        indices = ((py - y0) * largura + px)[dentro]
+        acumulado += np.bincount(indices, weights=valores[dentro], minlength=faixa.size)
+
+    faixa += acumulado.reshape(faixa.shape).astype(np.float32)
+
+
+def renderizar_campo(catalogo, largura, altura, rng, fundo=10.0, ruido_leitura=5.0,
+                     poisson=True, dtype=np.uint8, saida=None, altura_faixa=512,
+                     pixels_por_bloco=PIXELS_POR_BLOCO):
+    """
+    Renderiza o catálogo numa imagem (altura x largura), faixa por faixa:
+    a memória usada depende da faixa, não do frame, então 'saida' pode ser
+    um np.memmap (ou o caminho de um .npy) de qualquer tamanho.
+
+    Ruído: Poisson (fóton) sobre fundo + estrelas e Gaussiano de leitura.
+    """
+    forma = (altura, largura)
+    imagem = _criar_saida(saida, forma, dtype)
+    limite = np.iinfo(dtype).max if np.issubdtype(dtype, np.integer) else None
+
+    # Estrelas ordenadas por y: cada faixa pega só as que a alcançam
+    ordenado = catalogo[np.argsort(catalogo['y'], kind='stable')]
+    raio = int(np.ceil(4 * catalogo['sigma'].max())) if len(catalogo) else 0
+
+    for y0 in range(0, altura, altura_faixa):
+        y1 = min(y0 + altura_faixa, altura)
+        faixa = np.full((y1 - y0, largura), fundo, dtype=np.float32)
+
+        a, b = np.searchsorted(ordenado['y'], [y0 - raio - 1, y1 + raio + 1])
+        if b > a:
+            _somar_estrelas(faixa, ordenado[a:b], y0, pixels_por_bloco)
+
+        if poisson:
+            faixa = rng.poisson(faixa).astype(np.float32)
+        if ruido_leitura > 0:
+            faixa += rng.standard_normal(faixa.shape, dtype=np.float32) * np.float32(ruido_leitura)
+
+        if limite is not None:
+            np.clip(faixa, 0, limite, out=faixa)
+            np.rint(faixa, out=faixa)
+        imagem[y0:y1] = faixa
+
+    if isinstance(imagem, np.memmap):
+        imagem.flush()
+    return imagem
+
+
+def gerar_ceu(largura=800, altura=600, num_estrelas=30, semente=None, sigma=(0.7, 1.5),
+              fluxo=(500.0, 5000.0), fundo=10.0, ruido_leitura=5.0, poisson=True,
+              dtype=np.uint8, saida=None, margem=0):
+    """
+    Gera um céu sintético reprodutível e devolve (imagem, catalogo_real).
+    Mesma 'semente' -> mesma imagem e mesmo catálogo.
+    """
+    rng = np.random.default_rng(semente)
+    catalogo = sortear_catalogo(largura, altura, num_estrelas, rng, sigma, fluxo, margem)
+    imagem = renderizar_campo(catalogo, largura, altura, rng, fundo, ruido_leitura,
+                              poisson, dtype, saida)
+    return imagem, catalogo
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera um campo estelar sintético com catálogo real.")
+    parser.add_argument("saida", help="Arquivo .npy da imagem (mapeado em memória)")
+    parser.add_argument("--largura", type=int, default=7680)
+    parser.add_argument("--altura", type=int, default=4320)
+    parser.add_argument("-n", "--estrelas", type=int, default=100_000)
+    parser.add_argument("-s", "--semente", type=int, default=0)
+    parser.add_argument("--uint16", action="store_true", help="Gera 16 bits em vez de 8")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    _, catalogo = gerar_ceu(args.largura, args.altura, args.estrelas, args.semente,
+                            dtype=np.uint16 if args.uint16 else np.uint8, saida=args.saida)
+    caminho_catalogo = args.saida.replace(".npy", "") + "_catalogo.npy"
+    np.save(caminho_catalogo, catalogo)
+    print(f"{len(catalogo)} estrelas em {args.largura}x{args.altura} "
+          f"({time.perf_counter() - inicio:.2f} s). Catálogo: '{caminho_catalogo}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+import cv2
+import numpy as np
+
+# Formato da lista de blobs (uma linha por blob)
+BLOB_DTYPE = np.dtype([('x', np.float32), ('y', np.float32), ('sigma', np.float32), ('resposta', np.float32)])
+
+def niveis_dog(imagem, sigma_min=1.0, niveis_por_oitava=2, num_oitavas=4):
+    """
+    Gera, um de cada vez, os níveis da pilha DoG (Difference of Gaussians)
+    como tuplas (oitava, indice, sigma, dog).
+
+    - Cada borrão REAPROVEITA o anterior: borrar com sigma_a e depois com
+      sqrt(sigma_b^2 - sigma_a^2) equivale a borrar com sigma_b direto,
+      mas o segundo kernel é bem menor.
+    - A cada vez que o sigma dobra (uma "oitava"), a imagem é reduzida pela
+      metade, então os kernels nunca crescem e as escalas grandes custam pouco.
+    - DoG(sigma) = G(sigma) - G(k * sigma) é positivo no centro de blobs
+      claros e aproxima o LoG normalizado pela escala.
+
+    Cada oitava tem niveis_por_oitava + 2 níveis DoG (índices 0 a s+1):
+    o primeiro e o último só servem de vizinhos para a busca de máximos.
+    """
+    s = niveis_por_oitava
+    k = 2 ** (1 / s)
+    base = sigma_min / k # Assim o nível 1 da primeira oitava tem sigma = sigma_min
+
+    gauss = cv2.GaussianBlur(imagem.astype(np.float32), (0, 0), base)
+    for oitava in range(num_oitavas):
+        anterior = gauss
+        proxima_oitava = None
+        for i in range(1, s + 3):
+            incremento = base * np.sqrt(k**(2 * i) - k**(2 * (i - 1)))
+            atual = cv2.GaussianBlur(anterior, (0, 0), incremento)
+            if i == s:
+                # Sigma relativo = 2 * base: vira a base da próxima oitava
+                proxima_oitava = atual[::2, ::2].copy()
+
+            # Reaproveita o buffer do borrão anterior para guardar o DoG
+            np.subtract(anterior, atual, out=anterior)
+            yield oitava, i - 1, base * k**(i - 1) * 2**oitava, anterior
+            anterior = atual
+
+        gauss = proxima_oitava
+        if min(gauss.shape[:2]) < 8:
+            break
+
+# Desempate da supressão de não-máximos em platôs (pixels vizinhos com o
+# MESMO valor): o pico precisa ser estritamente maior que os vizinhos que vêm
+# ANTES na ordem (nível, y, x) e só >= aos que vêm depois. Assim cada platô
+# gera um pico só, e não um por pixel. Âncora no centro (1, 1).
+VIZINHOS_ANTES = np.array([[1, 1, 1],
+                           [1, 0, 0],
+                           [0, 0, 0]], np.uint8)
+VIZINHOS_DEPOIS = np.array([[0, 0, 0],
+                            [0, 0, 1],
+                            [1, 1, 1]], np.uint8)
+
+def detectar_blobs_dog(imagem, sigma_min=1.0, sigma_max=8.0, niveis_por_oitava=2, limiar=5.0, fundir=True):
+    """
+    Detector de blobs multi-escala: máximos locais 3D (x, y, escala) da pilha DoG.
+
+    A supressão de não-máximos é vetorizada: um cv2.dilate 3x3 dá o máximo
+    espacial de cada nível, e o máximo entre os níveis vizinhos (abaixo,
+    atual, acima) completa a vizinhança 3x3x3. Só 3 níveis ficam em memória
+    por vez, então frames 8K cabem folgados.
+
+    Cada pico é refinado com uma parábola por eixo (x, y e escala), então a
+    posição é sub-pixel mesmo nas oitavas reduzidas. Com 'fundir', o mesmo
+    blob achado em escalas/oitavas vizinhas vira um só (ver fundir_blobs).
+
+    Retorna um array estruturado (x, y, sigma, resposta); o raio aproximado
+    de cada blob é sigma * sqrt(2).
+    """
+    num_oitavas = max(1, int(np.ceil(np.log2(sigma_max / sigma_min))) + 1)
+    elemento = np.ones((3, 3), np.uint8)
+    blobs = []
+
+    # Janela deslizante de 3 níveis da MESMA oitava: (sigma, dog, dog_dilatado)
+    janela = []
+    for oitava, indice, sigma, dog in niveis_dog(imagem, sigma_min, niveis_por_oitava, num_oitavas):
+        if indice == 0:
+            janela = []
+        janela.append((sigma, dog, cv2.dilate(dog, elemento)))
+        if len(janela) == 3:
+            sigma_meio = janela[1][0]
+            if sigma_meio <= sigma_max * 1.001:
+                picos = _picos_nivel(janela, limiar)
+                # Volta as coordenadas para a resolução original
+                picos['x'] *= 2**oitava
+                picos['y'] *= 2**oitava
+                picos['sigma'] *= sigma_meio
+                blobs.append(picos)
+            janela.pop(0)
+
+    blobs = np.concatenate(blobs) if blobs else np.empty(0, dtype=BLOB_DTYPE)
+    return fundir_blobs(blobs) if fundir else blobs
+
+def _picos_nivel(janela, limiar):
+    (sigma_abaixo, dog_abaixo, dilatado_abaixo), (sigma, dog, _), (sigma_acima, dog_acima, dilatado_acima) = janela
+
+    # Vizinhança 3x3x3 dividida pela ordem (nível, y, x): o nível de baixo e
+    # metade do próprio nível vêm antes do centro, o resto vem depois
+    antes = cv2.dilate(dog, VIZINHOS_ANTES)
+    np.maximum(antes, dilatado_abaixo, out=antes)
+    depois = cv2.dilate(dog, VIZINHOS_DEPOIS)
+    np.maximum(depois, dilatado_acima, out=depois)
+
+    # Pico = passa do limiar, é o maior da vizinhança e vence os empates
+    candidatos = dog > limiar
+    candidatos &= dog > antes
+    candidatos &= dog >= depois
+    ys, xs = np.nonzero(candidatos)
+
+    # Parábola por 3 pontos em cada eixo: deslocamento = -g / c, com
+    # g = (f(+1) - f(-1)) / 2 e c = f(+1) - 2 f(0) + f(-1) (< 0 num máximo).
+    # Na borda o vizinho que falta é o próprio pixel (deslocamento 0 ou para dentro).
+    altura, largura = dog.shape
+    centro = dog[ys, xs]
+    eixos = (
+        (dog[ys, np.maximum(xs - 1, 0)], dog[ys, np.minimum(xs + 1, largura - 1)]),
+        (dog[np.maximum(ys - 1, 0), xs], dog[np.minimum(ys + 1, altura - 1), xs]),
+        (dog_abaixo[ys, xs], dog_acima[ys, xs]),
+    )
+    deslocamentos = []
+    resposta = centro.copy()
+    for menos, mais in eixos:
+        g = (mais - menos) / 2
+        c = mais - 2 * centro + menos
+        with np.errstate(divide="ignore", invalid="ignore"):
+            d = np.where(c < 0, -g / c, 0.0)
+        d = np.clip(d, -0.5, 0.5)
+        resposta += g * d / 2
+        deslocamentos.append(d)
+    dx, dy, ds = deslocamentos
+
+    # Os níveis são igualmente espaçados em log(sigma): o passo é sigma_acima / sigma
+    k = sigma_acima / sigma
+    resultado = np.empty(len(xs), dtype=BLOB_DTYPE)
+    resultado['x'] = xs + dx
+    resultado['y'] = ys + dy
+    resultado['sigma'] = k ** ds  # Relativo: o chamador multiplica pelo sigma do nível
+    resultado['resposta'] = resposta
+    return resultado
+
+def fundir_blobs(blobs, fator_raio=np.sqrt(2)):
+    """
+    Junta detecções do mesmo blob em escalas diferentes (o fim de uma oitava
+    e o começo da seguinte enxergam as mesmas escalas): um blob é descartado
+    se um blob de resposta MAIOR está a menos de max(raio dos dois) dele,
+    com raio = sigma * fator_raio. Empates de resposta: fica o de menor índice.
+
+    Vetorizado: os blobs são agrupados em células do tamanho do maior raio
+    (divisão inteira), ordenados pela célula, e cada um é comparado com os
+    das 3x3 células vizinhas com operações de array (searchsorted + repeat).
+    """
+    n = len(blobs)
+    if n < 2:
+        return blobs
+    raios = blobs['sigma'].astype(np.float64) * fator_raio
+    x = blobs['x'].astype(np.float64)
+    y = blobs['y'].astype(np.float64)
+    # Posição de cada blob na ordem de resposta decrescente (0 = o mais forte)
+    ordem = np.argsort(-blobs['resposta'], kind='stable')
+    posto = np.empty(n, dtype=np.int64)
+    posto[ordem] = np.arange(n)
+
+    celula = max(float(raios.max()), 1e-6)
+    cx = np.floor(x / celula).astype(np.int64)
+    cy = np.floor(y / celula).astype(np.int64)
+    cx -= cx.min() - 1  # >= 1: as vizinhas cx - 1 não ficam negativas
+    cy -= cy.min() - 1
+    colunas = int(cx.max()) + 2
+    chave = cy * colunas + cx
+    por_celula = np.argsort(chave, kind='stable')
+    chaves_ordenadas = chave[por_celula]
+
+    suprimido = np.zeros(n, dtype=bool)
+    for dy in (-1, 0, 1):
+        for dx in (-1, 0, 1):
+            vizinha = chave + dy * colunas + dx
+            inicio = np.searchsorted(chaves_ordenadas, vizinha, side='left')
+            fim = np.searchsorted(chaves_ordenadas, vizinha, side='right')
+            quantos = fim - inicio
+            total = int(quantos.sum())
+            if total == 0:
+                continue
+            # Todos os pares (i, j) com j na célula vizinha de i
+            i = np.repeat(np.arange(n), quantos)
+            desvio = np.arange(total) - np.repeat(np.cumsum(quantos) - quantos, quantos)
+            j = por_celula[np.repeat(inicio, quantos) + desvio]
+
+            mais_forte = posto[j] < posto[i]
+            i, j = i[mais_forte], j[mais_forte]
+            perto = (x[i] - x[j])**2 + (y[i] - y[j])**2 <= np.maximum(raios[i], raios[j])**2
+            suprimido[i[perto]] = True
+    return blobs[~suprimido]
+
+def main():
+    import matplotlib.pyplot as plt
+
+    # 1. Céu com estrelas de TRÊS tamanhos diferentes
+    ceu = np.zeros((400, 600), dtype=np.uint8)
+    for i, raio in enumerate((1, 3, 6)):
+        for j in range(5):
+            cv2.circle(ceu, (60 + j * 110, 70 + i * 130), raio, 220, -1)
+    ceu = cv2.GaussianBlur(ceu, (0, 0), 1.0)
+
+    # 2. Detectar em várias escalas
+    blobs = detectar_blobs_dog(ceu, sigma_min=1.0, sigma_max=8.0, limiar=5.0)
+    print(f"{len(blobs)} blobs detectados")
+
+    # 3. Visualizar: o raio do círculo desenhado vem da escala característica
+    resultado = cv2.cvtColor(ceu, cv2.COLOR_GRAY2BGR)
+    for blob in blobs:
+        raio = int(round(blob['sigma'] * np.sqrt(2))) + 2
+        cv2.circle(resultado, (int(round(blob['x'])), int(round(blob['y']))), raio, (0, 255, 0), 1)
+
+    plt.figure(figsize=(12, 5))
+    plt.subplot(1, 2, 1)
+    plt.imshow(ceu, cmap='gray')
+    plt.title("Estrelas de raios 1, 3 e 6")
+    plt.axis('off')
+
+    plt.subplot(1, 2, 2)
+    plt.imshow(cv2.cvtColor(resultado, cv2.COLOR_BGR2RGB))
+    plt.title("DoG multi-escala\n(círculo proporcional à escala detectada)")
+    plt.axis('off')
+
+    plt.tight_layout()
+    plt.show()
+
+if __name__ == "__main__":
+    main()
@@ -1,34 +1,38 @@
 import cv2
 import numpy as np
-import matplotlib.pyplot as plt
 
-def criar_ceu_estrelado():
-    """Gera uma imagem sintética de céu com estrelas e ruído de sensor."""
+from ceu_sintetico import gerar_ceu
+
+def criar_ceu_estrelado(semente=None, retornar_catalogo=False):
+    """
+    Gera uma imagem sintética de céu com estrelas e ruído de sensor.
+    Com a mesma 'semente' a imagem é sempre a mesma; com retornar_catalogo=True
+    devolve também as posições reais das estrelas (para conferir a detecção).
+    """
     largura, altura = 800, 600
-    ceu = np.zeros((altura, largura), dtype=np.uint8)
-    
-    # 1. Adicionar Estrelas (Pontos brilhantes de tamanhos variados)
-    import random
-    estrelas_reais = []
-    for _ in range(30):
-        x = random.randint(20, largura-20)
-        y = random.randint(20, altura-20)
-        brilho = random.randint(150, 255)
-        raio = random.randint(1, 3) # Estrelas maiores e menores
-        
-        # Desenhamos círculos sólidos (blobs)
-        cv2.circle(ceu, (x, y), raio, brilho, -1)
-        # Salvar coordenada para conferência visual depois
-        estrelas_reais.append((x, y))
-        
-    # 2. Adicionar Ruído (Simulando ISO alto)
-    ruido = np.random.normal(0, 10, ceu.shape).astype(np.int16)
-    ceu_ruidoso = cv2.add(ceu.astype(np.int16), ruido)
-    ceu_final = np.clip(ceu_ruidoso, 0, 255).astype(np.uint8)
-    
+
+    # 30 estrelas com PSF Gaussiana de tamanhos variados (sigma 0.6 a 1.5)
+    # e ruído Gaussiano (simulando ISO alto). Pico = fluxo / (2 pi sigma²):
+    # de ~40 (fraca e larga) a ~1500 (forte e compacta), então as estrelas
+    # mais fortes saturam em 255 no uint8
+    ceu_final, estrelas_reais = gerar_ceu(largura, altura, num_estrelas=30, semente=semente,
+                                          sigma=(0.6, 1.5), fluxo=(600.0, 3500.0),
+                                          fundo=0.0, ruido_leitura=10.0, poisson=False,
+                                          margem=20)
+
+    if retornar_catalogo:
+        return ceu_final, estrelas_reais
     return ceu_final
 
-def detectar_estrelas(imagem):
+# Formato do catálogo de estrelas (uma linha por estrela)
+CATALOGO_DTYPE = np.dtype([('x', np.float64), ('y', np.float64), ('fluxo', np.float64), ('area', np.int32)])
+
+def detectar_estrelas(imagem, desenhar=True):
+    """
+    Detecta estrelas com LoG + threshold.
+    Retorna (imagem_resultado, lap_norm, mascara, catalogo); a imagem com as
+    marcações só é desenhada se desenhar=True (senão vem None).
+    """
     # --- PASSO 1: LoG (Laplacian of Gaussian) ---
     
     # A. Gaussian Blur
@@ -55,36 +59,72 @@ def detectar_estrelas(imagem):
     # Tudo abaixo de pixel valor 100 é considerado "vazio"
     _, mask_estrelas = cv2.threshold(lap_norm, 100, 255, cv2.THRESH_BINARY)
 
-    # --- PASSO 3: ENCONTRAR COORDENADAS (Centróides) ---
-    
-    # A máscara agora tem "ilhas" brancas onde estão as estrelas.
-    # Usamos Contornos para achar o centro dessas ilhas.
-    contornos, _ = cv2.findContours(mask_estrelas, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-    
+    # --- PASSO 3: CATÁLOGO (Centróides sub-pixel) ---
+    catalogo = extrair_catalogo(imagem, mask_estrelas)
+
+    # --- PASSO 4: DESENHO (Opcional) ---
+    imagem_resultado = None
+    if desenhar:
+        imagem_resultado = desenhar_catalogo(imagem, catalogo)
+
+    return imagem_resultado, lap_norm, mask_estrelas, catalogo
+
+def extrair_catalogo(imagem, mascara):
+    """
+    Extrai o catálogo de TODAS as estrelas da máscara de uma vez só:
+    - connectedComponentsWithStats rotula as "ilhas" brancas;
+    - np.bincount soma, por rótulo, a intensidade e a intensidade * x / * y,
+      gerando centróides ponderados pelo brilho (precisão sub-pixel).
+    Ilhas sem área interna (um pixel solto ou uma linha de 1 pixel de
+    espessura: área == maior lado da caixa) são ruído e ficam de fora,
+    como no antigo filtro de contornos com momento m00 == 0.
+    Retorna um array estruturado com os campos x, y, fluxo e area.
+    """
+    num_rotulos, rotulos, stats, centroides = cv2.connectedComponentsWithStats(mascara, connectivity=8)
+    # O rótulo 0 é o fundo
+    area = stats[1:, cv2.CC_STAT_AREA]
+    com_area = area > np.maximum(stats[1:, cv2.CC_STAT_WIDTH], stats[1:, cv2.CC_STAT_HEIGHT])
+
+    # Só os pixels que pertencem a alguma estrela
+    ys, xs = np.nonzero(rotulos)
+    rotulo_pixel = rotulos[ys, xs]
+    peso = imagem[ys, xs].astype(np.float64)
+
+    fluxo = np.bincount(rotulo_pixel, weights=peso, minlength=num_rotulos)[1:][com_area]
+    soma_x = np.bincount(rotulo_pixel, weights=peso * xs, minlength=num_rotulos)[1:][com_area]
+    soma_y = np.bincount(rotulo_pixel, weights=peso * ys, minlength=num_rotulos)[1:][com_area]
+
+    catalogo = np.empty(len(fluxo), dtype=CATALOGO_DTYPE)
+    catalogo['fluxo'] = fluxo
+    catalogo['area'] = area[com_area]
+
+    # Blob totalmente escuro (fluxo 0): usa o centro geométrico
+    com_fluxo = fluxo > 0
+    catalogo['x'] = centroides[1:, 0][com_area]
+    catalogo['y'] = centroides[1:, 1][com_area]
+    catalogo['x'][com_fluxo] = soma_x[com_fluxo] / fluxo[com_fluxo]
+    catalogo['y'][com_fluxo] = soma_y[com_fluxo] / fluxo[com_fluxo]
+    return catalogo
+
+def desenhar_catalogo(imagem, catalogo):
+    """Desenha um círculo verde ao redor de cada estrela e marca o centro."""
     imagem_resultado = cv2.cvtColor(imagem, cv2.COLOR_GRAY2BGR)
-    contagem = 0
-    
-    for cnt in contornos:
-        # Calcular o momento para achar o centro do blob
-        M = cv2.moments(cnt)
-        if M["m00"] != 0:
-            cX = int(M["m10"] / M["m00"])
-            cY = int(M["m01"] / M["m00"])
-            
-            # Desenhar um círculo verde ao redor da estrela detectada
-            cv2.circle(imagem_resultado, (cX, cY), 10, (0, 255, 0), 2)
-            # Marcar o centro
-            cv2.circle(imagem_resultado, (cX, cY), 1, (0, 0, 255), -1)
-            contagem += 1
-            
-    return imagem_resultado, lap_norm, mask_estrelas, contagem
+    centros = np.column_stack((catalogo['x'], catalogo['y'])).round().astype(int)
+    for cX, cY in centros:
+        cv2.circle(imagem_resultado, (int(cX), int(cY)), 10, (0, 255, 0), 2)
+    # Os centros (1 pixel vermelho) são marcados de uma vez, sem loop
+    imagem_resultado[centros[:, 1], centros[:, 0]] = (0, 0, 255)
+    return imagem_resultado
 
 def main():
+    import matplotlib.pyplot as plt
+
     # 1. Gerar imagem
     ceu = criar_ceu_estrelado()
     
     # 2. Detectar
-    resultado, mapa_laplaciano, mascara, num_estrelas = detectar_estrelas(ceu)
+    resultado, mapa_laplaciano, mascara, catalogo = detectar_estrelas(ceu)
+    num_estrelas = len(catalogo)
     
     # 3. Visualizar
     plt.figure(figsize=(12, 8))
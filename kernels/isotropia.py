@@ -0,0 +1,141 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+import _raiz  # noqa: F401 (módulos da raiz do projeto no sys.path)
+from convolucao import convoluir
+from gradientes import KERNEL_PREWITT_X, KERNEL_PREWITT_Y
+
+
+def kernels_deriv(ksize):
+    """
+    Par (kx, ky) 2D dos kernels de derivada do OpenCV: ksize = 3, 5, 7...
+    para Sobel ou cv2.FILTER_SCHARR para Scharr.
+    """
+    derivada, suavizacao = cv2.getDerivKernels(1, 0, ksize, ktype=cv2.CV_64F)
+    kx = np.outer(suavizacao, derivada)
+    return kx, kx.T.copy()
+
+
+def familias_padrao():
+    """Kernels comparados por padrão: nome -> (kx, ky)."""
+    return {
+        "Prewitt": (KERNEL_PREWITT_X, KERNEL_PREWITT_Y),
+        "Sobel 3x3": kernels_deriv(3),
+        "Sobel 5x5": kernels_deriv(5),
+        "Sobel 7x7": kernels_deriv(7),
+        "Scharr": kernels_deriv(cv2.FILTER_SCHARR),
+    }
+
+
+def criar_circulo(tamanho=500, raio=150, suavizacao=5):
+    """
+    Círculo branco sólido com a borda levemente suavizada: a borda passa
+    por TODOS os ângulos.
+    O disco é desenhado pela distância ao centro (cobertura parcial nos
+    pixels da borda), não pelo cv2.circle: o contorno em "escada" do
+    cv2.circle desvia a normal em até ~10°, escondendo o erro dos kernels.
+    """
+    centro = tamanho // 2
+    y, x = np.mgrid[:tamanho, :tamanho]
+    distancia = np.hypot(x - centro, y - centro)
+    img = 255 * np.clip(raio + 0.5 - distancia, 0, 1)
+    return cv2.GaussianBlur(img, (suavizacao, suavizacao), 0)
+
+
+def mapas_anel(centro, raios, angulos):
+    """
+    Coordenadas (map_x, map_y) de todos os pontos do anel de uma vez:
+    formato (len(raios), len(angulos)), prontas para o cv2.remap.
+    """
+    cx, cy = centro
+    raios = np.asarray(raios, dtype=np.float64)[:, None]
+    map_x = (cx + raios * np.cos(angulos)).astype(np.float32)
+    map_y = (cy + raios * np.sin(angulos)).astype(np.float32)
+    return map_x, map_y
+
+
+def analisar_kernel(imagem, kx, ky, mapas, angulos):
+    """
+    Aplica o par (kx, ky) e mede, em cada ângulo da borda:
+    - a magnitude relativa (média na banda de raios / média geral: 1.0 = isotrópico);
+    - o erro da direção do gradiente em graus (atan2(gy, gx) vs. a normal real).
+    """
+    gx = convoluir(imagem, cv2.CV_64F, kx)
+    gy = convoluir(imagem, cv2.CV_64F, ky)
+
+    # Amostragem bilinear (sub-pixel) de gx e gy juntos: 2 canais num só remap
+    amostras = cv2.remap(cv2.merge([gx, gy]), mapas[0], mapas[1], cv2.INTER_LINEAR)
+    ax, ay = amostras[..., 0], amostras[..., 1]
+
+    magnitude = np.sqrt(ax**2 + ay**2).mean(axis=0)
+    magnitude_relativa = magnitude / magnitude.mean()
+
+    # O gradiente de um disco claro aponta para DENTRO: direção real = ângulo + 180°.
+    # A soma vetorial na banda dá uma direção por ângulo, menos sensível ao ruído.
+    direcao = np.arctan2(ay.sum(axis=0), ax.sum(axis=0))
+    erro = np.angle(np.exp(1j * (direcao - angulos - np.pi)))
+    erro_graus = np.rad2deg(erro)
+
+    return {
+        "angulos": np.rad2deg(angulos),
+        "magnitude_relativa": magnitude_relativa,
+        "erro_angular": erro_graus,
+        "desvio_magnitude": float(magnitude_relativa.std()),
+        "amplitude_magnitude": float(np.ptp(magnitude_relativa)),
+        "erro_angular_medio": float(np.abs(erro_graus).mean()),
+        "erro_angular_rms": float(np.sqrt((erro_graus**2).mean())),
+        "erro_angular_max": float(np.abs(erro_graus).max()),
+    }
+
+
+def analisar_isotropia(kernels=None, imagem=None, centro=None, raio=150, largura_banda=3.0,
+                       amostras_banda=7, num_angulos=360, trabalhadores=None):
+    """
+    Compara a isotropia de vários operadores de gradiente.
+
+    - kernels: dict nome -> (kx, ky), ou nome -> kx (ky = kx transposto).
+      Padrão: familias_padrao() (Prewitt, Sobel 3/5/7, Scharr).
+    - imagem/centro/raio: imagem de teste com uma borda circular de raio 'raio'
+      em torno de 'centro' (x, y). Padrão: criar_circulo().
+    - largura_banda/amostras_banda: a borda é lida numa banda de raios
+      (raio ± largura_banda/2), não num único raio.
+
+    Os kernels rodam em paralelo (o OpenCV libera o GIL). Retorna um dict
+    nome -> estatísticas de analisar_kernel, ordenado do mais ao menos isotrópico.
+    """
+    if kernels is None:
+        kernels = familias_padrao()
+    if imagem is None:
+        imagem = criar_circulo(raio=raio)
+    if centro is None:
+        centro = (imagem.shape[1] // 2, imagem.shape[0] // 2)
+    imagem = np.asarray(imagem, dtype=np.float64)
+
+    angulos = np.linspace(0, 2 * np.pi, num_angulos, endpoint=False)
+    raios = raio + np.linspace(-largura_banda / 2, largura_banda / 2, amostras_banda)
+    mapas = mapas_anel(centro, raios, angulos)
+
+    pares = {}
+    for nome, kernel in kernels.items():
+        kx, ky = kernel if isinstance(kernel, tuple) else (kernel, np.asarray(kernel).T)
+        pares[nome] = (np.asarray(kx, dtype=np.float64), np.asarray(ky, dtype=np.float64))
+
+    with ThreadPoolExecutor(max_workers=trabalhadores) as executor:
+        futuros = {nome: executor.submit(analisar_kernel, imagem, kx, ky, mapas, angulos)
+                   for nome, (kx, ky) in pares.items()}
+        resultados = {nome: futuro.result() for nome, futuro in futuros.items()}
+
+    return dict(sorted(resultados.items(), key=lambda item: item[1]["desvio_magnitude"]))
+
+
+def imprimir_relatorio(resultados):
+    print(f"{'Kernel':12s} {'Osc. magnitude':>15s} {'Erro ang. médio':>16s} {'Erro ang. máx.':>15s}")
+    for nome, r in resultados.items():
+        print(f"{nome:12s} {r['desvio_magnitude']:15.4f} {r['erro_angular_medio']:15.3f}° "
+              f"{r['erro_angular_max']:14.3f}°")
+
+
+if __name__ == "__main__":
+    imprimir_relatorio(analisar_isotropia())
@@ -1,22 +1,18 @@
 import cv2
 import numpy as np
-import matplotlib.pyplot as plt
 
-def criar_imagem_com_ruido():
+import _raiz  # noqa: F401 (módulos da raiz do projeto no sys.path)
+import ruido
+
+def criar_imagem_com_ruido(semente=None):
     # 1. Criar imagem limpa (Fundo preto, Círculo Branco)
-    img = np.zeros((300, 300), dtype=np.float64)
+    img = np.zeros((300, 300), dtype=np.uint8)
     cv2.circle(img, (150, 150), 80, 255, -1)
-    
+
     # 2. Adicionar Ruído Gaussiano (Granulação típica de fotos)
-    media = 0
+    # Direto no uint8: soma, satura em 0-255 e arredonda
     desvio = 20 # Intensidade do ruído
-    ruido = np.random.normal(media, desvio, img.shape)
-    
-    img_ruidosa = img + ruido
-    
-    # Garantir que fique entre 0 e 255
-    img_ruidosa = np.clip(img_ruidosa, 0, 255).astype(np.uint8)
-    return img_ruidosa
+    return ruido.gaussiano(img, desvio, media=0, rng=semente)
 
 def aplicar_laplaciano(img, titulo):
     # Aplica Laplaciano (cv2.CV_64F é vital para não perder os valores negativos)
@@ -30,6 +26,8 @@ def aplicar_laplaciano(img, titulo):
     return lap
 
 def main():
+    import matplotlib.pyplot as plt
+
     # 1. Preparar o cenário
     img = criar_imagem_com_ruido()
 
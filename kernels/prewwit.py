@@ -1,6 +1,8 @@
 import cv2
 import numpy as np
-import matplotlib.pyplot as plt
+
+import _raiz  # noqa: F401 (módulos da raiz do projeto no sys.path)
+from convolucao import convoluir
 
 def criar_imagem_sintetica():
     """Cria uma imagem com quadrado, círculo e triângulo para teste geométrico."""
@@ -22,6 +24,8 @@ def criar_imagem_sintetica():
     return img
 
 def main():
+    import matplotlib.pyplot as plt
+
     # Gera a imagem
     img = criar_imagem_sintetica()
 
@@ -41,8 +45,8 @@ def main():
     # --- APLICAÇÃO (Convolução) ---
     # Importante: Usar float64 (CV_64F) para manter os números negativos!
     # Se usar uint8 direto, a borda que vai do branco pro preto (negativa) vira 0.
-    prewitt_x = cv2.filter2D(img, cv2.CV_64F, kernel_prewitt_x)
-    prewitt_y = cv2.filter2D(img, cv2.CV_64F, kernel_prewitt_y)
+    prewitt_x = convoluir(img, cv2.CV_64F, kernel_prewitt_x)
+    prewitt_y = convoluir(img, cv2.CV_64F, kernel_prewitt_y)
 
     # --- CÁLCULO DA MAGNITUDE ---
     # Pitágoras: sqrt(x^2 + y^2)
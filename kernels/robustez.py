@@ -0,0 +1,287 @@
+import argparse
+import functools
+import json
+import multiprocessing
+import os
+import statistics
+import time
+
+import cv2
+import numpy as np
+
+import _raiz  # noqa: F401 (módulos da raiz do projeto no sys.path)
+import gradientes
+import ruido
+from prewwit import criar_imagem_sintetica
+
+OPERADORES = ("prewitt", "sobel", "log", "canny")
+
+# Níveis varridos por tipo de ruído (o significado de cada nível: ver ruido.aplicar).
+# "nenhum" é a referência sem ruído.
+NIVEIS = {
+    "nenhum": (0.0,),
+    "sal_pimenta": (0.05, 0.20, 0.35),
+    "gaussiano": (20.0, 80.0, 140.0),
+    "poisson": (0.05, 0.01, 0.003),
+    "speckle": (0.3, 1.2, 2.5),
+}
+
+# Sigma do GaussianBlur antes do operador (0 = sem suavização)
+SIGMAS = (0.0, 1.0, 2.0)
+
+# Limiares testados: quantis da resposta do operador. O F de cada célula é
+# o do melhor limiar (como o "ODS" do BSDS para uma imagem).
+QUANTIS = np.linspace(0.80, 0.995, 40)
+
+
+@functools.lru_cache(maxsize=None)
+def verdade():
+    """
+    (imagem, bordas_reais, distancia_ate_borda) da imagem sintética do prewwit.py.
+    A borda real é o contorno de 1 pixel das formas (pixels da forma com
+    algum vizinho-4 de fora).
+    """
+    imagem = criar_imagem_sintetica()
+    forma = (imagem > 127).astype(np.uint8)
+    cruz = cv2.getStructuringElement(cv2.MORPH_CROSS, (3, 3))
+    bordas = (forma - cv2.erode(forma, cruz)).astype(bool)
+    distancia = cv2.distanceTransform((~bordas).astype(np.uint8), cv2.DIST_L2, 3)
+    return imagem, bordas, distancia
+
+
+def avaliar(detectadas, bordas, distancia, tolerancia=2.0):
+    """
+    (precisão, revocação, F) de um mapa binário de bordas.
+    Um pixel detectado é acerto se houver borda real a até 'tolerancia' pixels;
+    um pixel de borda real é encontrado se houver detecção a essa distância.
+    """
+    num_detectadas = np.count_nonzero(detectadas)
+    if num_detectadas == 0:
+        return 0.0, 0.0, 0.0
+    precisao = np.count_nonzero(distancia[detectadas] <= tolerancia) / num_detectadas
+    ate_deteccao = cv2.distanceTransform((~detectadas).astype(np.uint8), cv2.DIST_L2, 3)
+    revocacao = np.count_nonzero(ate_deteccao[bordas] <= tolerancia) / np.count_nonzero(bordas)
+    if precisao + revocacao == 0:
+        return 0.0, 0.0, 0.0
+    return precisao, revocacao, 2 * precisao * revocacao / (precisao + revocacao)
+
+
+def suavizar(imagem, sigma):
+    if sigma <= 0:
+        return imagem
+    return cv2.GaussianBlur(imagem, (0, 0), sigma)
+
+
+def resposta(imagem, operador):
+    """
+    Mapa float32 de "força de borda" do operador (antes do limiar):
+    magnitude do gradiente (prewitt, sobel, e |gx| + |gy| do Sobel para o
+    canny, que é a norma que ele usa) ou a inclinação nos cruzamentos por
+    zero do Laplaciano (log; o "G" vem do pré-blur).
+    """
+    if operador == "prewitt":
+        return gradientes.magnitude(*gradientes.prewitt(imagem))
+    if operador == "sobel":
+        return gradientes.magnitude(*gradientes.sobel(imagem))
+    if operador == "canny":
+        gx, gy = gradientes.sobel(imagem)
+        return np.abs(gx) + np.abs(gy)
+    if operador == "log":
+        lap = cv2.Laplacian(imagem, cv2.CV_32F, ksize=3)
+        forca = np.zeros_like(lap)
+        # Troca de sinal com o vizinho da direita ou de baixo: o pixel é borda,
+        # com força = salto do Laplaciano entre os dois
+        cruza = lap[:, :-1] * lap[:, 1:] < 0
+        forca[:, :-1][cruza] = np.abs(lap[:, :-1] - lap[:, 1:])[cruza]
+        cruza = lap[:-1, :] * lap[1:, :] < 0
+        salto = np.abs(lap[:-1, :] - lap[1:, :])
+        np.maximum(forca[:-1, :], np.where(cruza, salto, 0), out=forca[:-1, :])
+        return forca
+    raise ValueError(f"Operador '{operador}' inválido. Use um de {OPERADORES}.")
+
+
+def detectar(imagem, operador, forca, limiar):
+    """Mapa binário de bordas para um limiar (no canny: alto = limiar, baixo = limiar / 2)."""
+    if operador == "canny":
+        return cv2.Canny(imagem, limiar / 2, limiar, L2gradient=False) > 0
+    return forca > limiar
+
+
+def _gerador_celula(semente, tipo, nivel, repeticao):
+    # Mesmo (semente, tipo, nivel, repeticao) -> mesma imagem ruidosa em qualquer
+    # processo e em qualquer grade: todos os operadores/sigmas veem o mesmo ruído
+    tipos = tuple(NIVEIS) + tuple(t for t in ruido.TIPOS if t not in NIVEIS)
+    entropia = [semente, tipos.index(tipo), repeticao, int(round(nivel * 1e6))]
+    return np.random.default_rng(np.random.SeedSequence(entropia))
+
+
+def chave(celula):
+    return "|".join(f"{campo}={celula[campo]}" for campo in
+                    ("tipo", "nivel", "operador", "sigma", "repeticao", "semente", "tolerancia"))
+
+
+def avaliar_celula(celula, repeticoes_tempo=5):
+    """
+    Uma célula da grade: aplica o ruído, o pré-blur e o operador, varre os
+    limiares e devolve as métricas do melhor, com o tempo (mediana de
+    'repeticoes_tempo' execuções) de blur + operador.
+    """
+    imagem, bordas, distancia = verdade()
+    ruidosa = imagem.copy()
+    if celula["tipo"] != "nenhum":
+        rng = _gerador_celula(celula["semente"], celula["tipo"], celula["nivel"], celula["repeticao"])
+        ruido.aplicar(ruidosa, celula["tipo"], celula["nivel"], rng=rng)
+
+    operador, sigma = celula["operador"], celula["sigma"]
+    suave = suavizar(ruidosa, sigma)
+    forca = resposta(suave, operador)
+
+    melhor = (-1.0, 0.0, 0.0, 0.0)  # (F, precisão, revocação, limiar)
+    for limiar in np.unique(np.quantile(forca, QUANTIS)):
+        p, r, f = avaliar(detectar(suave, operador, forca, limiar), bordas, distancia, celula["tolerancia"])
+        if f > melhor[0]:
+            melhor = (f, p, r, float(limiar))
+    f, p, r, limiar = melhor
+
+    tempos = []
+    for _ in range(repeticoes_tempo):
+        inicio = time.perf_counter()
+        suave_t = suavizar(ruidosa, sigma)
+        if operador == "canny":
+            cv2.Canny(suave_t, limiar / 2, limiar)
+        else:
+            resposta(suave_t, operador)
+        tempos.append(time.perf_counter() - inicio)
+
+    return dict(celula, chave=chave(celula), precisao=p, revocacao=r, f=max(f, 0.0),
+                limiar=limiar, tempo_ms=statistics.median(tempos) * 1000)
+
+
+def montar_grade(niveis=None, operadores=OPERADORES, sigmas=SIGMAS, repeticoes=3, semente=0, tolerancia=2.0):
+    """Lista de células: tipo/nível de ruído x operador x sigma x repetição."""
+    niveis = NIVEIS if niveis is None else niveis
+    grade = []
+    for tipo, valores in niveis.items():
+        for nivel in valores:
+            # Sem ruído todas as repetições dariam o mesmo resultado
+            for repeticao in range(1 if tipo == "nenhum" else repeticoes):
+                for operador in operadores:
+                    for sigma in sigmas:
+                        grade.append({"tipo": tipo, "nivel": float(nivel), "operador": operador,
+                                      "sigma": float(sigma), "repeticao": repeticao,
+                                      "semente": semente, "tolerancia": float(tolerancia)})
+    return grade
+
+
+def carregar_cache(caminho):
+    """Resultados já gravados (chave -> resultado). Ignora a linha cortada de uma interrupção."""
+    resultados = {}
+    if caminho and os.path.exists(caminho):
+        with open(caminho, encoding="utf-8") as arquivo:
+            for linha in arquivo:
+                try:
+                    resultado = json.loads(linha)
+                except json.JSONDecodeError:
+                    continue
+                resultados[resultado["chave"]] = resultado
+    return resultados
+
+
+def _inicializar_trabalhador():
+    # Cada processo usa 1 thread no OpenCV: o paralelismo vem do pool
+    cv2.setNumThreads(1)
+
+
+def executar_varredura(grade, cache=None, processos=None, intervalo_relatorio=50):
+    """
+    Avalia as células da grade num pool de processos. Com 'cache' (arquivo
+    JSONL) cada célula concluída é gravada na hora e as já gravadas são
+    puladas: uma varredura interrompida continua de onde parou.
+    Retorna os resultados de todas as células da grade.
+    """
+    feitos = carregar_cache(cache)
+    pendentes = [celula for celula in grade if chave(celula) not in feitos]
+    print(f"{len(grade)} células | {len(grade) - len(pendentes)} no cache | {len(pendentes)} a calcular")
+
+    if pendentes:
+        if cache and os.path.dirname(cache):
+            os.makedirs(os.path.dirname(cache), exist_ok=True)
+        arquivo = open(cache, "a+", encoding="utf-8") if cache else None
+        if arquivo and arquivo.tell() > 0:
+            # Linha cortada no fim: começa numa linha nova, senão o próximo resultado se perde junto
+            arquivo.seek(arquivo.tell() - 1)
+            if arquivo.read(1) != "\n":
+                arquivo.write("\n")
+        inicio = time.perf_counter()
+        try:
+            with multiprocessing.Pool(processos, initializer=_inicializar_trabalhador) as pool:
+                for n, resultado in enumerate(pool.imap_unordered(avaliar_celula, pendentes, chunksize=4), 1):
+                    feitos[resultado["chave"]] = resultado
+                    if arquivo:
+                        arquivo.write(json.dumps(resultado) + "\n")
+                        arquivo.flush()
+                    if intervalo_relatorio and n % intervalo_relatorio == 0:
+                        decorrido = time.perf_counter() - inicio
+                        print(f"{n}/{len(pendentes)} células | {n / decorrido:.1f} células/s")
+        finally:
+            if arquivo:
+                arquivo.close()
+
+    return [feitos[chave(celula)] for celula in grade]
+
+
+def resumir(resultados):
+    """Média das repetições: (tipo, nivel, operador, sigma) -> métricas."""
+    grupos = {}
+    for r in resultados:
+        grupos.setdefault((r["tipo"], r["nivel"], r["operador"], r["sigma"]), []).append(r)
+    return {
+        grupo: {campo: float(np.mean([r[campo] for r in lista]))
+                for campo in ("precisao", "revocacao", "f", "tempo_ms")}
+        for grupo, lista in grupos.items()
+    }
+
+
+def imprimir_relatorio(resumo):
+    sigmas = sorted({s for (_, _, _, s) in resumo})
+    print(f"{'ruído':12s} {'nível':>6s} {'operador':8s} | "
+          + " ".join(f"{'F s=' + format(s, 'g'):>8s}" for s in sigmas) + f" | {'melhor P / R':13s}     | {'ms':>5s}")
+    ultimo = None
+    # Na ordem da grade (o resumo guarda a ordem de inserção)
+    for tipo, nivel, operador in dict.fromkeys(g[:3] for g in resumo):
+        if ultimo is not None and (tipo, nivel) != ultimo:
+            print()
+        ultimo = (tipo, nivel)
+        linha = [resumo.get((tipo, nivel, operador, s)) for s in sigmas]
+        melhor = max((m for m in linha if m), key=lambda m: m["f"])
+        print(f"{tipo:12s} {nivel:6g} {operador:8s} | "
+              + " ".join(f"{m['f']:8.3f}" if m else f"{'-':>8s}" for m in linha)
+              + f" | {melhor['precisao']:.3f} / {melhor['revocacao']:.3f}"
+              + f"     | {melhor['tempo_ms']:5.2f}")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(
+        description="Robustez ao ruído: ruído x operador de bordas x pré-blur, com F contra a borda real.")
+    parser.add_argument("--cache", default="robustez.jsonl",
+                        help="JSONL com as células concluídas (retoma varreduras interrompidas)")
+    parser.add_argument("--tipos", nargs="+", choices=list(NIVEIS), default=list(NIVEIS))
+    parser.add_argument("--operadores", nargs="+", choices=OPERADORES, default=list(OPERADORES))
+    parser.add_argument("--sigmas", nargs="+", type=float, default=list(SIGMAS))
+    parser.add_argument("-r", "--repeticoes", type=int, default=3, help="Sorteios de ruído por nível")
+    parser.add_argument("-s", "--semente", type=int, default=0)
+    parser.add_argument("--tolerancia", type=float, default=2.0, help="Distância (px) aceita até a borda real")
+    parser.add_argument("-p", "--processos", type=int, default=None,
+                        help="Número de processos (padrão: todos os núcleos)")
+    args = parser.parse_args()
+
+    grade = montar_grade({tipo: NIVEIS[tipo] for tipo in args.tipos}, args.operadores, args.sigmas,
+                         args.repeticoes, args.semente, args.tolerancia)
+    inicio = time.perf_counter()
+    resultados = executar_varredura(grade, args.cache, args.processos)
+    print(f"Varredura em {time.perf_counter() - inicio:.2f} s\n")
+    imprimir_relatorio(resumir(resultados))
+
+
+if __name__ == "__main__":
+    main_cli()
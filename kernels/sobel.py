@@ -1,26 +1,16 @@
 import cv2
 import numpy as np
-import matplotlib.pyplot as plt
 
-def adicionar_ruido_sal_pimenta(imagem, quantidade=0.05):
+import _raiz  # noqa: F401 (módulos da raiz do projeto no sys.path)
+import ruido
+
+def adicionar_ruido_sal_pimenta(imagem, quantidade=0.05, semente=None):
     """
-    Adiciona ruído 'Sal e Pimenta' a uma imagem.
+    Adiciona ruído 'Sal e Pimenta' a uma imagem (devolve uma cópia).
     quantidade: porcentagem de pixels que serão afetados (ex: 0.05 = 5%)
     """
-    row, col = imagem.shape
-    s_vs_p = 0.5 # Divisão meio a meio entre sal e pimenta
-    out = np.copy(imagem)
-    
-    # Adicionar Sal (pixels brancos)
-    num_salt = np.ceil(quantidade * imagem.size * s_vs_p)
-    coords = [np.random.randint(0, i - 1, int(num_salt)) for i in imagem.shape]
-    out[tuple(coords)] = 255
-
-    # Adicionar Pimenta (pixels pretos)
-    num_pepper = np.ceil(quantidade * imagem.size * (1. - s_vs_p))
-    coords = [np.random.randint(0, i - 1, int(num_pepper)) for i in imagem.shape]
-    out[tuple(coords)] = 0
-    return out
+    # Divisão meio a meio entre sal (255) e pimenta (0)
+    return ruido.sal_pimenta(imagem.copy(), quantidade, proporcao_sal=0.5, rng=semente)
 
 def normalizar_para_exibicao(img_float):
     """Converte imagem float (com negativos) para uint8 (0-255) para exibir"""
@@ -31,6 +21,8 @@ def normalizar_para_exibicao(img_float):
     return img_norm
 
 def main():
+    import matplotlib.pyplot as plt
+
     # 1. CRIAR IMAGEM SINTÉTICA LIMPA
     img_limpa = np.zeros((300, 300), dtype=np.uint8)
     # Desenhando um quadrado branco no centro
@@ -1,9 +1,13 @@
 import cv2
 import os
 import numpy as np
-import matplotlib.pyplot as plt
+
+import _raiz  # noqa: F401 (módulos da raiz do projeto no sys.path)
+from convolucao import convoluir
 
 def comparar_filtros(caminho_imagem):
+    import matplotlib.pyplot as plt
+
     # 1. Carrega em Escala de Cinza (0)
     img = cv2.imread(caminho_imagem, 0)
     if img is None:
@@ -22,13 +26,13 @@ def comparar_filtros(caminho_imagem):
 
     # 3. Aplicação (Usando float64 para precisão matemática)
     # Prewitt
-    px = cv2.filter2D(img, cv2.CV_64F, k_prewitt_x)
-    py = cv2.filter2D(img, cv2.CV_64F, k_prewitt_y)
+    px = convoluir(img, cv2.CV_64F, k_prewitt_x)
+    py = convoluir(img, cv2.CV_64F, k_prewitt_y)
     mag_prewitt = np.sqrt(px**2 + py**2) # Pitágoras
 
     # Sobel
-    sx = cv2.filter2D(img, cv2.CV_64F, k_sobel_x)
-    sy = cv2.filter2D(img, cv2.CV_64F, k_sobel_y)
+    sx = convoluir(img, cv2.CV_64F, k_sobel_x)
+    sy = convoluir(img, cv2.CV_64F, k_sobel_y)
     mag_sobel = np.sqrt(sx**2 + sy**2)   # Pitágoras
 
     # 4. Normalização (0-255) para visualização
@@ -61,4 +65,5 @@ def comparar_filtros(caminho_imagem):
 
 CAMINHO_IMAGEM = f"{os.path.dirname(__file__)}/image.png"
 
-comparar_filtros(CAMINHO_IMAGEM)
\ No newline at end of file
+if __name__ == "__main__":
+    comparar_filtros(CAMINHO_IMAGEM)
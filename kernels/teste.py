@@ -1,8 +1,9 @@
 import cv2
 import numpy as np
-import matplotlib.pyplot as plt
 
 def main():
+    import matplotlib.pyplot as plt
+
     # 1. CRIAR O "RUÍDO" (Um único pixel branco no meio do nada)
     # Usamos uma imagem 7x7 para ficar fácil de ler no terminal
     img_ponto = np.zeros((7, 7), dtype=np.float32)
@@ -0,0 +1,115 @@
+import argparse
+
+import cv2
+import numpy as np
+
+
+def abrir_mapeada(caminho):
+    """Abre um .npy como memória mapeada (somente leitura): nada é carregado na RAM."""
+    return np.load(caminho, mmap_mode="r")
+
+
+def criar_saida_mapeada(caminho, forma, dtype=np.uint8):
+    """Cria um .npy de saída mapeado em memória, escrito aos pedaços."""
+    return np.lib.format.open_memmap(caminho, mode="w+", dtype=dtype, shape=tuple(forma))
+
+
+def percorrer_ladrilhos(forma, tamanho, halo):
+    """
+    Divide a imagem em ladrilhos de 'tamanho' x 'tamanho'.
+    Para cada um gera:
+    - leitura: região a ler (ladrilho + 'halo' pixels de cada lado, sem sair da imagem);
+    - util: parte do resultado (em coordenadas da leitura) que é válida;
+    - destino: onde essa parte vai na imagem de saída.
+    """
+    altura, largura = forma[:2]
+    for y0 in range(0, altura, tamanho):
+        y1 = min(y0 + tamanho, altura)
+        ly0, ly1 = max(y0 - halo, 0), min(y1 + halo, altura)
+        for x0 in range(0, largura, tamanho):
+            x1 = min(x0 + tamanho, largura)
+            lx0, lx1 = max(x0 - halo, 0), min(x1 + halo, largura)
+
+            leitura = (slice(ly0, ly1), slice(lx0, lx1))
+            util = (slice(y0 - ly0, y1 - ly0), slice(x0 - lx0, x1 - lx0))
+            destino = (slice(y0, y1), slice(x0, x1))
+            yield leitura, util, destino
+
+
+def _magnitude_sobel(ladrilho):
+    # Mesmas contas de main.aplicar_filtro_sobel (antes da normalização)
+    sobelx = cv2.Sobel(ladrilho, cv2.CV_64F, 1, 0, ksize=3)
+    sobely = cv2.Sobel(ladrilho, cv2.CV_64F, 0, 1, ksize=3)
+    return np.sqrt(sobelx**2 + sobely**2)
+
+
+def _magnitude_laplaciano(ladrilho):
+    # Mesmas contas de kernels/laplaciano.aplicar_laplaciano (antes da normalização)
+    return np.absolute(cv2.Laplacian(ladrilho, cv2.CV_64F, ksize=3))
+
+
+def aplicar_normalizado_em_ladrilhos(entrada, saida, funcao, halo, tamanho=1024):
+    """
+    Aplica 'funcao' (que devolve uma magnitude float) ladrilho por ladrilho e
+    grava np.uint8(255 * magnitude / max) em 'saida'.
+
+    O máximo é GLOBAL, então são duas passadas:
+    1. calcula só o máximo de cada ladrilho;
+    2. recalcula e grava o resultado normalizado.
+    Recalcular é mais barato que guardar a magnitude float64 (8x o tamanho)
+    e o pico de memória fica limitado ao tamanho do ladrilho.
+
+    Como cada ladrilho é lido com 'halo' pixels de vizinhança (e nas bordas
+    reais da imagem o OpenCV usa a mesma reflexão de sempre), o resultado é
+    IDÊNTICO ao da versão que processa a imagem inteira.
+    """
+    if saida.shape != entrada.shape[:2]:
+        raise ValueError(f"Saída {saida.shape} não corresponde à entrada {entrada.shape[:2]}.")
+
+    # --- PASSADA 1: máximo global ---
+    maximo = 0.0
+    for leitura, util, _ in percorrer_ladrilhos(entrada.shape, tamanho, halo):
+        magnitude = funcao(np.ascontiguousarray(entrada[leitura]))
+        maximo = max(maximo, float(np.max(magnitude[util])))
+
+    # --- PASSADA 2: normalização e escrita ---
+    for leitura, util, destino in percorrer_ladrilhos(entrada.shape, tamanho, halo):
+        magnitude = funcao(np.ascontiguousarray(entrada[leitura]))[util]
+        saida[destino] = np.uint8(255 * magnitude / maximo)
+
+    if isinstance(saida, np.memmap):
+        saida.flush()
+    return saida
+
+
+def sobel_ladrilhado(entrada, saida, tamanho=1024):
+    """Versão out-of-core de aplicar_filtro_sobel (kernel 3x3 -> halo de 1 pixel)."""
+    return aplicar_normalizado_em_ladrilhos(entrada, saida, _magnitude_sobel, halo=1, tamanho=tamanho)
+
+
+def laplaciano_ladrilhado(entrada, saida, tamanho=1024):
+    """Versão out-of-core de aplicar_laplaciano (kernel 3x3 -> halo de 1 pixel)."""
+    return aplicar_normalizado_em_ladrilhos(entrada, saida, _magnitude_laplaciano, halo=1, tamanho=tamanho)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Sobel/Laplaciano em ladrilhos para imagens maiores que a RAM (.npy mapeado).")
+    parser.add_argument("entrada", help="Imagem em escala de cinza salva como .npy")
+    parser.add_argument("saida", help="Arquivo .npy de saída (uint8)")
+    parser.add_argument("-o", "--operador", choices=("sobel", "laplaciano"), default="sobel")
+    parser.add_argument("-t", "--tamanho", type=int, default=1024, help="Lado do ladrilho em pixels")
+    args = parser.parse_args()
+
+    entrada = abrir_mapeada(args.entrada)
+    saida = criar_saida_mapeada(args.saida, entrada.shape[:2])
+
+    if args.operador == "sobel":
+        sobel_ladrilhado(entrada, saida, args.tamanho)
+    else:
+        laplaciano_ladrilhado(entrada, saida, args.tamanho)
+    print(f"Resultado gravado em '{args.saida}' ({saida.shape[1]}x{saida.shape[0]}).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+import argparse
+import glob
+import multiprocessing
+import os
+import time
+
+import cv2
+import numpy as np
+
+import espectro
+import main
+import montagem
+
+EXTENSOES = (".jpg", ".jpeg", ".jfif", ".png", ".bmp", ".tif", ".tiff")
+
+
+def listar_imagens(entrada, recursivo=False):
+    """
+    Gera (sem montar a lista inteira) os caminhos das imagens de entrada.
+    'entrada' pode ser um diretório, um padrão glob ('fotos/*.jpg') ou um arquivo.
+    """
+    if os.path.isdir(entrada):
+        padrao = os.path.join(entrada, "**", "*") if recursivo else os.path.join(entrada, "*")
+    else:
+        padrao = entrada
+
+    for caminho in glob.iglob(padrao, recursive=recursivo):
+        if caminho.lower().endswith(EXTENSOES) and os.path.isfile(caminho):
+            yield caminho
+
+
+def raiz_entrada(entrada):
+    """Diretório a partir do qual os caminhos de 'entrada' são nomeados (a parte sem curingas)."""
+    if os.path.isdir(entrada):
+        return entrada
+    raiz = os.path.dirname(entrada)
+    while glob.has_magic(raiz):
+        raiz = os.path.dirname(raiz)
+    return raiz or "."
+
+
+class NomesSaida:
+    """
+    Nome de saída de cada imagem: o caminho relativo à raiz da entrada, sem a
+    extensão ('sub/foto.jpg' -> 'sub/foto'), para que 'a/x.png' e 'b/x.png'
+    não se sobrescrevam. Se a mesma base aparecer de novo ('x.jpg' e 'x.png'),
+    a extensão entra no nome ('x_png'). Roda no processo principal.
+    """
+
+    def __init__(self, entrada):
+        self.raiz = raiz_entrada(entrada)
+        self.usados = set()
+
+    def __call__(self, caminho):
+        base, extensao = os.path.splitext(os.path.relpath(caminho, self.raiz))
+        nome = base
+        if nome in self.usados:
+            nome = f"{base}_{extensao.lstrip('.').lower()}"
+        sufixo = 2
+        while nome in self.usados:
+            nome = f"{base}_{extensao.lstrip('.').lower()}_{sufixo}"
+            sufixo += 1
+        self.usados.add(nome)
+        return nome
+
+
+def salvar_espectro(caminho, espectro_log):
+    """Normaliza o espectro (log) para 0-255 e salva como PNG."""
+    img = cv2.normalize(espectro_log, None, 0, 255, cv2.NORM_MINMAX).astype(np.uint8)
+    cv2.imwrite(caminho, img)
+
+
+def processar_imagem(tarefa):
+    """
+    Executa o pipeline do main.py em UMA imagem e grava os resultados
+    com o prefixo 'base' (diretório de saída + NomesSaida).
+    Roda dentro dos processos do pool, então só devolve um resumo pequeno;
+    um erro numa imagem vira uma falha dela, sem derrubar o lote.
+    """
+    caminho, base, salvar_npy, relatorio = tarefa
+    inicio = time.perf_counter()
+
+    img_bgr = cv2.imread(caminho)
+    if img_bgr is None:
+        return caminho, False, "não foi possível carregar", 0.0
+
+    try:
+        # Mesmos passos do main.main, mas sem o cache em memória:
+        # no lote cada imagem aparece uma vez só, então o hash seria desperdício
+        img_gray = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2GRAY)
+        img_gray_suave = main.suavizar.__wrapped__(img_gray, 3)
+        img_bordas = main.aplicar_filtro_sobel.__wrapped__(img_gray_suave)
+        espectro_original = main.calcular_fft.__wrapped__(img_gray_suave)
+        espectro_bordas = main.calcular_fft.__wrapped__(img_bordas)
+
+        os.makedirs(os.path.dirname(base), exist_ok=True)
+        cv2.imwrite(f"{base}_bordas.png", img_bordas)
+        salvar_espectro(f"{base}_espectro.png", espectro_original)
+        salvar_espectro(f"{base}_espectro_bordas.png", espectro_bordas)
+        if salvar_npy:
+            np.save(f"{base}_espectro.npy", espectro_original)
+            np.save(f"{base}_espectro_bordas.npy", espectro_bordas)
+        if relatorio:
+            # Mesma grade 2x2 do main.main, desenhada sem matplotlib
+            paineis = main.paineis_relatorio(img_bgr, espectro_original, img_bordas, espectro_bordas)
+            montagem.salvar(f"{base}_relatorio.png", paineis, colunas=2)
+    except Exception as erro:
+        return caminho, False, f"{type(erro).__name__}: {erro}", time.perf_counter() - inicio
+
+    return caminho, True, "", time.perf_counter() - inicio
+
+
+def _inicializar_trabalhador():
+    # Cada processo usa 1 thread no OpenCV/FFT: o paralelismo vem do pool
+    cv2.setNumThreads(1)
+    espectro.WORKERS = 1
+
+
+def executar_lote(entrada, diretorio_saida, processos=None, recursivo=False,
+                  salvar_npy=False, intervalo_relatorio=100, relatorio=False):
+    """
+    Processa todas as imagens de 'entrada' com um pool de processos.
+    Os resultados chegam um a um (imap_unordered), sem acumular o lote.
+    Com relatorio=True grava também a montagem 2x2 de cada imagem.
+    As saídas repetem o caminho relativo à entrada (ver NomesSaida).
+    Retorna (processadas, falhas, segundos).
+    """
+    os.makedirs(diretorio_saida, exist_ok=True)
+    nomes = NomesSaida(entrada)
+    tarefas = ((caminho, os.path.join(diretorio_saida, nomes(caminho)), salvar_npy, relatorio)
+               for caminho in listar_imagens(entrada, recursivo))
+
+    processadas = falhas = 0
+    inicio = time.perf_counter()
+    with multiprocessing.Pool(processos, initializer=_inicializar_trabalhador) as pool:
+        for caminho, ok, erro, _ in pool.imap_unordered(processar_imagem, tarefas, chunksize=4):
+            if ok:
+                processadas += 1
+            else:
+                falhas += 1
+                print(f"Erro em '{caminho}': {erro}")
+
+            total = processadas + falhas
+            if intervalo_relatorio and total % intervalo_relatorio == 0:
+                decorrido = time.perf_counter() - inicio
+                print(f"{total} imagens | {total / decorrido:.1f} imagens/s")
+
+    decorrido = time.perf_counter() - inicio
+    return processadas, falhas, decorrido
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(
+        description="Executa o pipeline Sobel + FFT (sem janelas) sobre um diretório de imagens.")
+    parser.add_argument("entrada", help="Diretório, padrão glob (entre aspas) ou arquivo de imagem")
+    parser.add_argument("saida", help="Diretório onde os resultados serão gravados")
+    parser.add_argument("-p", "--processos", type=int, default=None,
+                        help="Número de processos (padrão: todos os núcleos)")
+    parser.add_argument("-r", "--recursivo", action="store_true", help="Busca imagens em subdiretórios")
+    parser.add_argument("--npy", action="store_true", help="Salva também os espectros brutos em .npy")
+    parser.add_argument("--relatorio", action="store_true",
+                        help="Grava também o relatório (imagem, bordas e espectros) de cada imagem em PNG")
+    parser.add_argument("--intervalo", type=int, default=100,
+                        help="Mostra a vazão a cada N imagens (0 desativa)")
+    args = parser.parse_args()
+
+    processadas, falhas, decorrido = executar_lote(
+        args.entrada, args.saida, args.processos, args.recursivo, args.npy, args.intervalo,
+        args.relatorio)
+
+    vazao = processadas / decorrido if decorrido > 0 else 0.0
+    print(f"--- Lote concluído ---")
+    print(f"Processadas: {processadas} | Falhas: {falhas}")
+    print(f"Tempo total: {decorrido:.2f} s | Vazão: {vazao:.1f} imagens/s")
+
+
+if __name__ == "__main__":
+    main_cli()
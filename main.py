@@ -1,24 +1,22 @@
 import cv2
 import numpy as np
-import matplotlib.pyplot as plt
 
+import espectro
+import montagem
+from cache import memoizar
+from convolucao import convoluir
+
+@memoizar
 def calcular_fft(imagem):
     """
     Calcula a Transformada de Fourier (FFT) 2D de uma imagem para visualização.
     Retorna o espectro de magnitude em escala logarítmica.
     """
-    # 1. Cálculo da FFT 2D
-    f = np.fft.fft2(imagem)
-    
-    # 2. Shift: Move a frequência zero (DC) dos cantos para o centro
-    fshift = np.fft.fftshift(f)
-    
-    # 3. Magnitude: Calcula o valor absoluto (módulo) dos números complexos
-    # 4. Log: Aplica logaritmo para reduzir a diferença dinâmica (o centro é muito brilhante)
-    magnitude_spectrum = 20 * np.log(np.abs(fshift) + 1)
-    
-    return magnitude_spectrum
+    # FFT real + fftshift + 20*log(|F| + 1), tudo no módulo espectro
+    # (float32 é visualmente idêntico e bem mais rápido)
+    return espectro.calcular_espectro(imagem, precisao=np.float32, epsilon=1)
 
+@memoizar
 def aplicar_filtro_sobel(imagem_gray):
     """Aplica o filtro de Sobel (Passa-Altas) usando funções otimizadas do OpenCV."""
     # Sobel X (Bordas verticais) - cv2.CV_64F permite números negativos
@@ -35,6 +33,11 @@ def aplicar_filtro_sobel(imagem_gray):
     
     return magnitude
 
+@memoizar
+def suavizar(imagem_gray, tamanho=3):
+    """Filtro Gaussiano (Passa-Baixas) suave para remover ruído antes das bordas."""
+    return cv2.GaussianBlur(imagem_gray, (tamanho, tamanho), 0)
+
 def aplicar_filtro_prewitt_manual(imagem_gray):
     """
     Aplica o filtro Prewitt via Convolução manual (filter2D) 
@@ -49,15 +52,28 @@ def aplicar_filtro_prewitt_manual(imagem_gray):
                          [ 0,  0,  0],
                          [ 1,  1,  1]])
 
-    # Aplicação da Convolução 2D
-    img_prewittx = cv2.filter2D(imagem_gray, -1, kernel_x)
-    img_prewitty = cv2.filter2D(imagem_gray, -1, kernel_y)
+    # Aplicação da Convolução 2D (como os kernels são separáveis,
+    # convoluir roda duas passadas 1D em vez do kernel 3x3 completo)
+    img_prewittx = convoluir(imagem_gray, -1, kernel_x)
+    img_prewitty = convoluir(imagem_gray, -1, kernel_y)
     
     # Combinação (aproximada pela soma dos valores absolutos para simplificar)
     prewitt_combinado = img_prewittx + img_prewitty
     return prewitt_combinado
 
-def main():
+def paineis_relatorio(img_original_bgr, espectro_original, img_bordas, espectro_bordas):
+    """Os 4 quadros do relatório (grade 2x2), para montagem.salvar ou montagem.mostrar."""
+    return [
+        montagem.painel(img_original_bgr, '1. Imagem Original'),
+        montagem.painel(espectro_original, '2. Espectro Original (FFT)\nObserve o centro brilhante (Baixas Freq)',
+                        cmap='inferno'),
+        montagem.painel(img_bordas, '3. Resultado Sobel (Passa-Altas)\nBordas detectadas'),
+        montagem.painel(espectro_bordas, '4. Espectro das Bordas\nObserve a dispersão (Altas Freq)',
+                        cmap='inferno'),
+    ]
+
+def main(saida=None):
+    """Mostra o relatório numa janela ou, se 'saida' for dada, grava o PNG (sem matplotlib)."""
     # --- 1. Carregamento da Imagem ---
     #caminho_imagem = r'C:\Users\Gabriel\Desktop\Emba\imagem_2.jpg'
     caminho_imagem = r'circulo_pret.jpg'
@@ -69,15 +85,12 @@ def main():
         print(f"Erro: Não foi possível carregar a imagem '{caminho_imagem}'. Verifique o nome.")
         return
 
-    # Converte para RGB (para o matplotlib mostrar as cores certas)
-    img_original_rgb = cv2.cvtColor(img_original_bgr, cv2.COLOR_BGR2RGB)
-    
     # Converte para Escala de Cinza (para o processamento matemático)
     img_gray = cv2.cvtColor(img_original_bgr, cv2.COLOR_BGR2GRAY)
 
     # --- 2. Pré-processamento (Remoção de Ruído) ---
     # Aplicamos um filtro Gaussiano (Passa-Baixas) suave antes
-    img_gray_suave = cv2.GaussianBlur(img_gray, (3, 3), 0)
+    img_gray_suave = suavizar(img_gray, 3)
 
     # --- 3. Aplicação dos Filtros (Detecção de Bordas) ---
     # Usando Sobel (Passa-Altas)
@@ -91,34 +104,13 @@ def main():
     espectro_bordas = calcular_fft(img_bordas)
 
     # --- 5. Visualização dos Resultados ---
-    plt.figure(figsize=(12, 8))
-
-    # Imagem Original
-    plt.subplot(2, 2, 1)
-    plt.imshow(img_original_rgb)
-    plt.title('1. Imagem Original')
-    plt.axis('off')
-
-    # Espectro Original
-    plt.subplot(2, 2, 2)
-    plt.imshow(espectro_original, cmap='inferno')
-    plt.title('2. Espectro Original (FFT)\nObserve o centro brilhante (Baixas Freq)')
-    plt.axis('off')
-
-    # Imagem de Bordas (Sobel)
-    plt.subplot(2, 2, 3)
-    plt.imshow(img_bordas, cmap='gray')
-    plt.title('3. Resultado Sobel (Passa-Altas)\nBordas detectadas')
-    plt.axis('off')
-
-    # Espectro das Bordas
-    plt.subplot(2, 2, 4)
-    plt.imshow(espectro_bordas, cmap='inferno')
-    plt.title('4. Espectro das Bordas\nObserve a dispersão (Altas Freq)')
-    plt.axis('off')
-
-    plt.tight_layout()
-    plt.show()
+    # A montagem desenha direto num array (rápido, sem janela); o matplotlib
+    # só é carregado para mostrar na tela
+    paineis = paineis_relatorio(img_original_bgr, espectro_original, img_bordas, espectro_bordas)
+    if saida:
+        montagem.salvar(saida, paineis, colunas=2)
+    else:
+        montagem.mostrar(paineis, colunas=2, figsize=(12, 8))
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
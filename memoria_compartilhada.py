@@ -0,0 +1,325 @@
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from multiprocessing import shared_memory
+
+import cv2
+import numpy as np
+
+import espectro
+import gradientes
+
+# Os scripts da pasta kernels/ importam uns aos outros pelo nome
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "kernels"))
+
+from ex_laplaciano import CATALOGO_DTYPE, detectar_estrelas
+
+OPERACOES = ("sobel", "laplaciano", "espectro", "estrelas")
+
+# Tipo do resultado de cada operação (estrelas: catálogo, não imagem)
+TIPO_RESULTADO = {"sobel": np.uint8, "laplaciano": np.uint8, "espectro": np.float32}
+
+
+class Anel:
+    """
+    'slots' buffers de formato fixo num único bloco de memória compartilhada.
+    Os processos trocam só o ÍNDICE do slot (o "handle"); os pixels nunca
+    passam pelo pickle.
+    """
+
+    def __init__(self, slots, forma, dtype, nome=None):
+        self.slots = slots
+        self.forma = tuple(forma)
+        self.dtype = np.dtype(dtype)
+        tamanho = slots * int(np.prod(self.forma)) * self.dtype.itemsize
+        if nome is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=max(tamanho, 1))
+            self.dono = True
+        else:
+            self.shm = shared_memory.SharedMemory(name=nome)
+            self.dono = False
+        self.dados = np.ndarray((slots,) + self.forma, dtype=self.dtype, buffer=self.shm.buf)
+
+    @property
+    def nome(self):
+        return self.shm.name
+
+    def ver(self, slot, forma=None, dtype=None):
+        """Vista (sem cópia) do slot, opcionalmente reinterpretada como outro formato/tipo."""
+        if forma is None:
+            return self.dados[slot]
+        bruto = self.dados[slot].reshape(-1).view(np.uint8)
+        tamanho = int(np.prod(forma)) * np.dtype(dtype).itemsize
+        return bruto[:tamanho].view(dtype).reshape(forma)
+
+    def fechar(self):
+        self.dados = None  # Solta a vista antes de fechar o mapeamento
+        self.shm.close()
+        if self.dono:
+            self.shm.unlink()
+
+
+class Resultado:
+    """
+    Resultado de um quadro, apontando para a memória compartilhada.
+    'dados' só vale até o slot ser liberado: copie se for guardar.
+    """
+
+    def __init__(self, slot, etiqueta, operacao, dados, segundos, erro=None):
+        self.slot = slot
+        self.etiqueta = etiqueta
+        self.operacao = operacao
+        self.dados = dados
+        self.segundos = segundos
+        self.erro = erro
+
+
+# ---------------------------------------------------------------------------
+# Lado do trabalhador
+# ---------------------------------------------------------------------------
+
+class _Contexto:
+    """Vistas dos anéis e buffers de trabalho de UM processo trabalhador."""
+
+    def __init__(self, nomes, forma, dtype, slots, max_estrelas):
+        self.forma = forma
+        self.quadros = Anel(slots, forma, dtype, nomes[0])
+        self.saidas = Anel(slots, forma, np.float32, nomes[1])
+        self.catalogos = Anel(slots, (max_estrelas,), CATALOGO_DTYPE, nomes[2])
+        self.espaco = gradientes.EspacoTrabalho(forma)
+
+    def fechar(self):
+        for anel in (self.quadros, self.saidas, self.catalogos):
+            anel.fechar()
+
+
+def _sobel(ctx, quadro, slot):
+    saida = ctx.saidas.ver(slot, ctx.forma, np.uint8)
+    gradientes.sobel(quadro, out=(ctx.espaco.gx, ctx.espaco.gy))
+    gradientes.magnitude(ctx.espaco.gx, ctx.espaco.gy, out=ctx.espaco.magnitude)
+    gradientes.normalizar(ctx.espaco.magnitude, out=saida)
+    return 0
+
+
+def _laplaciano(ctx, quadro, slot):
+    # Como kernels/laplaciano.aplicar_laplaciano, mas em float32 e sem temporários
+    saida = ctx.saidas.ver(slot, ctx.forma, np.uint8)
+    lap = ctx.espaco.magnitude
+    cv2.Laplacian(quadro, cv2.CV_32F, dst=lap, ksize=3)
+    np.absolute(lap, out=lap)
+    gradientes.normalizar(lap, out=saida)
+    return 0
+
+
+def _espectro(ctx, quadro, slot):
+    np.copyto(ctx.saidas.ver(slot), espectro.calcular_espectro(quadro, precisao=np.float32))
+    return 0
+
+
+def _estrelas(ctx, quadro, slot):
+    _, _, _, catalogo = detectar_estrelas(quadro, desenhar=False)
+    destino = ctx.catalogos.ver(slot)
+    if len(catalogo) > len(destino):
+        # Um catálogo cortado pareceria completo: melhor falhar o quadro
+        raise ValueError(f"{len(catalogo)} estrelas não cabem no slot (max_estrelas={len(destino)}).")
+    destino[:len(catalogo)] = catalogo
+    return len(catalogo)
+
+
+_FUNCOES = {"sobel": _sobel, "laplaciano": _laplaciano, "espectro": _espectro, "estrelas": _estrelas}
+
+
+def _trabalhador(nomes, forma, dtype, slots, max_estrelas, tarefas, resultados):
+    # Um processo por núcleo: as bibliotecas não devem abrir threads próprias
+    cv2.setNumThreads(1)
+    espectro.WORKERS = 1
+    ctx = _Contexto(nomes, forma, dtype, slots, max_estrelas)
+    try:
+        while True:
+            tarefa = tarefas.get()
+            if tarefa is None:
+                break
+            slot, operacao = tarefa
+            inicio = time.perf_counter()
+            try:
+                n = _FUNCOES[operacao](ctx, ctx.quadros.ver(slot), slot)
+                resultados.put((slot, None, n, time.perf_counter() - inicio))
+            except Exception as erro:
+                resultados.put((slot, repr(erro), 0, time.perf_counter() - inicio))
+    finally:
+        ctx.fechar()
+
+
+# ---------------------------------------------------------------------------
+# Lado do processo principal
+# ---------------------------------------------------------------------------
+
+class PoolCompartilhado:
+    """
+    Pool de processos que troca quadros e resultados por memória compartilhada.
+
+    Três anéis de 'slots' posições: quadros de entrada, saídas (imagem de
+    bordas/laplaciano em uint8 ou espectro em float32) e catálogos de estrelas.
+    As filas só carregam (slot, operacao) e (slot, erro, n, segundos).
+
+    Sobel e Laplaciano usam buffers float32 (metade da memória e da banda
+    do float64 do main): a normalização para 0-255 pode dar 1 nível a
+    menos que main.aplicar_filtro_sobel / aplicar_laplaciano em alguns
+    pixels. Um quadro com mais de 'max_estrelas' estrelas volta com erro.
+
+    Fluxo de um quadro: slot = obter_slot() -> escrever em quadro(slot) ->
+    enviar(slot, operacao) -> receber() -> usar Resultado.dados -> liberar(slot).
+    mapear() faz tudo isso para um iterável de quadros.
+    """
+
+    def __init__(self, forma, dtype=np.uint8, processos=None, slots=None, max_estrelas=10_000):
+        self.forma = tuple(forma[:2])
+        self.dtype = np.dtype(dtype)
+        self.processos = processos or os.cpu_count() or 1
+        # 2 slots por processo: um sendo processado, outro esperando na fila
+        self.slots = slots or 2 * self.processos
+        self.max_estrelas = max_estrelas
+
+        self.quadros = Anel(self.slots, self.forma, self.dtype)
+        self.saidas = Anel(self.slots, self.forma, np.float32)
+        self.catalogos = Anel(self.slots, (max_estrelas,), CATALOGO_DTYPE)
+        self.livres = list(range(self.slots))
+        self.em_uso = {}  # slot -> (etiqueta, operacao)
+
+        self.tarefas = multiprocessing.Queue()
+        self.resultados = multiprocessing.Queue()
+        nomes = (self.quadros.nome, self.saidas.nome, self.catalogos.nome)
+        self.trabalhadores = [
+            multiprocessing.Process(target=_trabalhador, daemon=True,
+                                    args=(nomes, self.forma, self.dtype, self.slots, max_estrelas,
+                                          self.tarefas, self.resultados))
+            for _ in range(self.processos)
+        ]
+        for processo in self.trabalhadores:
+            processo.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.fechar()
+
+    def quadro(self, slot):
+        """Vista do slot de entrada: escreva o quadro direto aqui (ex.: dst= do OpenCV)."""
+        return self.quadros.ver(slot)
+
+    def obter_slot(self):
+        """Um slot livre (se todos estiverem em uso, receba e libere resultados antes)."""
+        if not self.livres:
+            raise RuntimeError("Nenhum slot livre: chame receber() e liberar() antes.")
+        return self.livres.pop()
+
+    def enviar(self, slot, operacao, etiqueta=None):
+        if operacao not in OPERACOES:
+            raise ValueError(f"Operação '{operacao}' inválida. Use uma de {OPERACOES}.")
+        self.em_uso[slot] = (etiqueta, operacao)
+        self.tarefas.put((slot, operacao))
+
+    def receber(self, timeout=None):
+        """Próximo resultado pronto (em ordem de conclusão)."""
+        slot, erro, n, segundos = self.resultados.get(timeout=timeout)
+        etiqueta, operacao = self.em_uso[slot]
+        if erro is not None:
+            dados = None
+        elif operacao == "estrelas":
+            dados = self.catalogos.ver(slot)[:n]
+        else:
+            dados = self.saidas.ver(slot, self.forma, TIPO_RESULTADO[operacao])
+        return Resultado(slot, etiqueta, operacao, dados, segundos, erro)
+
+    def liberar(self, slot):
+        """Devolve o slot ao anel (as vistas do Resultado deixam de valer)."""
+        del self.em_uso[slot]
+        self.livres.append(slot)
+
+    def mapear(self, quadros, operacao):
+        """
+        Processa um iterável de quadros mantendo todos os slots ocupados.
+        Gera um Resultado por quadro (em ordem de conclusão; 'etiqueta' é o
+        índice do quadro). O slot é liberado quando o próximo é pedido.
+        """
+        iterador = enumerate(quadros)
+        esgotado = False
+        while True:
+            while self.livres and not esgotado:
+                item = next(iterador, None)
+                if item is None:
+                    esgotado = True
+                    break
+                indice, quadro = item
+                slot = self.obter_slot()
+                # A única cópia do quadro: para dentro da memória compartilhada
+                np.copyto(self.quadro(slot), quadro)
+                self.enviar(slot, operacao, indice)
+            if not self.em_uso:
+                return
+            resultado = self.receber()
+            try:
+                yield resultado
+            finally:
+                self.liberar(resultado.slot)
+
+    def fechar(self):
+        for _ in self.trabalhadores:
+            self.tarefas.put(None)
+        for processo in self.trabalhadores:
+            processo.join()
+        for anel in (self.quadros, self.saidas, self.catalogos):
+            anel.fechar()
+
+
+def _sobel_pickle(quadro):
+    import main
+    return main.aplicar_filtro_sobel.__wrapped__(quadro)
+
+
+def _medir_pickle(quadros, processos):
+    """Referência: multiprocessing.Pool comum, quadro e resultado via pickle."""
+    from lote import _inicializar_trabalhador
+
+    inicio = time.perf_counter()
+    with multiprocessing.Pool(processos, initializer=_inicializar_trabalhador) as pool:
+        for _ in pool.imap_unordered(_sobel_pickle, quadros):
+            pass
+    return time.perf_counter() - inicio
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Vazão do pool de memória compartilhada em quadros sintéticos.")
+    parser.add_argument("--largura", type=int, default=3840)
+    parser.add_argument("--altura", type=int, default=2160)
+    parser.add_argument("-n", "--quadros", type=int, default=32)
+    parser.add_argument("-p", "--processos", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    parser.add_argument("--operacao", choices=OPERACOES, default="sobel")
+    parser.add_argument("--comparar-pickle", action="store_true",
+                        help="Mede também um multiprocessing.Pool comum (só para sobel)")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    forma = (args.altura, args.largura)
+    # Poucos quadros distintos, reusados: o gerador não deve dominar a medição
+    base = [rng.integers(0, 256, forma, dtype=np.uint8) for _ in range(4)]
+    quadros = [base[i % len(base)] for i in range(args.quadros)]
+
+    for processos in sorted(set(args.processos)):
+        with PoolCompartilhado(forma, processos=processos) as pool:
+            inicio = time.perf_counter()
+            for resultado in pool.mapear(quadros, args.operacao):
+                if resultado.erro:
+                    print(f"Erro no quadro {resultado.etiqueta}: {resultado.erro}")
+            decorrido = time.perf_counter() - inicio
+        print(f"{processos:2d} processos | memória compartilhada: {args.quadros / decorrido:7.2f} quadros/s")
+        if args.comparar_pickle and args.operacao == "sobel":
+            decorrido = _medir_pickle(quadros, processos)
+            print(f"{processos:2d} processos | pickle:                {args.quadros / decorrido:7.2f} quadros/s")
+
+
+if __name__ == "__main__":
+    main_cli()
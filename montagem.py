@@ -0,0 +1,153 @@
+import functools
+import unicodedata
+
+import cv2
+import numpy as np
+
+# Mapas de cores disponíveis (nome do matplotlib -> colormap do OpenCV)
+MAPAS = {"gray": None, "inferno": cv2.COLORMAP_INFERNO, "jet": cv2.COLORMAP_JET}
+
+FONTE = cv2.FONT_HERSHEY_SIMPLEX
+
+
+def painel(imagem, titulo="", cmap="gray", vmin=None, vmax=None):
+    """
+    Uma célula da grade, no estilo do plt.imshow + plt.title.
+    'imagem' 2D é colorida com 'cmap'; 3 canais é tratada como BGR do OpenCV.
+    imagem=None deixa a célula só com o título.
+    """
+    return {"imagem": imagem, "titulo": titulo, "cmap": cmap, "vmin": vmin, "vmax": vmax}
+
+
+@functools.lru_cache(maxsize=None)
+def tabela_cores(cmap):
+    """LUT (1, 256, 3) BGR do mapa de cores, calculada UMA vez por mapa."""
+    if cmap not in MAPAS:
+        raise ValueError(f"Mapa de cores '{cmap}' inválido. Use um de {tuple(MAPAS)}.")
+    rampa = np.arange(256, dtype=np.uint8).reshape(1, 256)
+    if MAPAS[cmap] is None:
+        lut = cv2.cvtColor(rampa, cv2.COLOR_GRAY2BGR)
+    else:
+        lut = cv2.applyColorMap(rampa, MAPAS[cmap])
+    lut.setflags(write=False)
+    return lut
+
+
+def normalizar(imagem, vmin=None, vmax=None):
+    """
+    Leva a imagem para 0-255 como o imshow: [vmin, vmax] -> [0, 255]
+    (padrão: mínimo e máximo da própria imagem), saturando fora do intervalo.
+    """
+    if imagem.dtype == np.uint8 and vmin is None and vmax is None:
+        # Igual ao imshow (que também estica uint8 pelo mínimo/máximo)
+        return cv2.normalize(imagem, None, 0, 255, cv2.NORM_MINMAX)
+    dados = np.asarray(imagem, dtype=np.float32)
+    vmin = float(dados.min()) if vmin is None else vmin
+    vmax = float(dados.max()) if vmax is None else vmax
+    if vmax <= vmin:
+        return np.zeros(dados.shape, dtype=np.uint8)
+    escala = 255.0 / (vmax - vmin)
+    # convertScaleAbs não serve (tira o sinal); multiply/subtract + clip in-place
+    saida = np.subtract(dados, vmin, dtype=np.float32)
+    saida *= escala
+    np.clip(saida, 0, 255, out=saida)
+    return saida.astype(np.uint8)
+
+
+def colorir(imagem, cmap="gray", vmin=None, vmax=None):
+    """Imagem 2D -> BGR uint8 pelo mapa de cores; BGR é devolvida como está."""
+    if imagem.ndim == 3:
+        return imagem if imagem.dtype == np.uint8 else normalizar(imagem, vmin, vmax)
+    cinza = normalizar(imagem, vmin, vmax)
+    return cv2.LUT(cv2.cvtColor(cinza, cv2.COLOR_GRAY2BGR), tabela_cores(cmap))
+
+
+def texto_ascii(texto):
+    """A fonte Hershey do OpenCV não tem acentos: 'Frequência' -> 'Frequencia'."""
+    decomposto = unicodedata.normalize("NFKD", texto)
+    return "".join(c for c in decomposto if not unicodedata.combining(c) and ord(c) < 128)
+
+
+def _escala_fonte(linhas, largura_max, escala):
+    # Diminui a fonte até a linha mais longa caber na largura da célula
+    for linha in linhas:
+        largura = cv2.getTextSize(linha, FONTE, escala, 1)[0][0]
+        if largura > largura_max:
+            escala *= largura_max / largura
+    return escala
+
+
+def _encaixar(imagem, largura, altura):
+    """Redimensiona mantendo a proporção (pixels nítidos ao ampliar, como o imshow)."""
+    h, w = imagem.shape[:2]
+    fator = min(largura / w, altura / h)
+    tamanho = (max(1, round(w * fator)), max(1, round(h * fator)))
+    interpolacao = cv2.INTER_NEAREST if fator > 1 else cv2.INTER_AREA
+    return cv2.resize(imagem, tamanho, interpolation=interpolacao)
+
+
+def montar(paineis, colunas, celula=(256, 256), margem=10, escala_fonte=0.45, fundo=255):
+    """
+    Compõe os painéis numa grade com 'colunas' colunas, direto num canvas
+    NumPy BGR (sem matplotlib). 'celula' = (largura, altura) da área de cada imagem.
+    Painéis None deixam a célula vazia.
+    """
+    largura_celula, altura_celula = celula
+    linhas_grade = -(-len(paineis) // colunas)
+
+    titulos = [texto_ascii(p["titulo"]).split("\n") if p and p["titulo"] else [] for p in paineis]
+    altura_linha = cv2.getTextSize("Ag", FONTE, escala_fonte, 1)[0][1] + 8
+    altura_titulo = max((len(t) for t in titulos), default=0) * altura_linha + 4
+
+    passo_x = largura_celula + margem
+    passo_y = altura_celula + altura_titulo + margem
+    canvas = np.full((linhas_grade * passo_y + margem, colunas * passo_x + margem, 3), fundo, dtype=np.uint8)
+
+    for i, (p, linhas) in enumerate(zip(paineis, titulos)):
+        if p is None:
+            continue
+        x0 = margem + (i % colunas) * passo_x
+        y0 = margem + (i // colunas) * passo_y
+
+        escala = _escala_fonte(linhas, largura_celula, escala_fonte)
+        for n, linha in enumerate(linhas):
+            largura_texto = cv2.getTextSize(linha, FONTE, escala, 1)[0][0]
+            origem = (x0 + (largura_celula - largura_texto) // 2, y0 + (n + 1) * altura_linha - 4)
+            cv2.putText(canvas, linha, origem, FONTE, escala, (0, 0, 0), 1, cv2.LINE_AA)
+
+        if p["imagem"] is None:
+            continue
+        imagem = _encaixar(colorir(p["imagem"], p["cmap"], p["vmin"], p["vmax"]), largura_celula, altura_celula)
+        h, w = imagem.shape[:2]
+        y = y0 + altura_titulo + (altura_celula - h) // 2
+        x = x0 + (largura_celula - w) // 2
+        canvas[y:y + h, x:x + w] = imagem
+
+    return canvas
+
+
+def salvar(caminho, paineis, colunas, **opcoes):
+    """Monta a grade e grava em PNG (ou qualquer formato do cv2.imwrite)."""
+    if not cv2.imwrite(caminho, montar(paineis, colunas, **opcoes)):
+        raise ValueError(f"Não foi possível gravar '{caminho}'.")
+
+
+def mostrar(paineis, colunas, figsize=None):
+    """A mesma grade numa janela do matplotlib (importado só aqui)."""
+    import matplotlib.pyplot as plt
+
+    linhas_grade = -(-len(paineis) // colunas)
+    plt.figure(figsize=figsize)
+    for i, p in enumerate(paineis):
+        if p is None:
+            continue
+        plt.subplot(linhas_grade, colunas, i + 1)
+        if p["imagem"] is not None:
+            if p["imagem"].ndim == 3:
+                plt.imshow(cv2.cvtColor(p["imagem"], cv2.COLOR_BGR2RGB))
+            else:
+                plt.imshow(p["imagem"], cmap=p["cmap"], vmin=p["vmin"], vmax=p["vmax"])
+        plt.title(p["titulo"])
+        plt.axis('off')
+    plt.tight_layout()
+    plt.show()
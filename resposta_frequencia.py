@@ -0,0 +1,183 @@
+import functools
+
+import numpy as np
+
+import espectro
+from cache import CacheResultados
+
+# Grade padrão (altura, largura) das respostas em frequência
+FORMA_PADRAO = (64, 64)
+
+# Cache próprio: as respostas são pequenas e não devem disputar espaço com
+# as imagens do CACHE_PADRAO. Chave = bytes do kernel + formato + grade.
+CACHE_TRANSFERENCIAS = CacheResultados(max_bytes=64 * 1024**2)
+
+
+def posicionar(kernel, forma=FORMA_PADRAO, out=None):
+    """
+    Resposta ao impulso do cv2.filter2D com 'kernel' numa grade 'forma',
+    com o centro (âncora) na origem (0, 0) e o resto dando a volta pelas bordas.
+
+    O filter2D faz CORRELAÇÃO: a resposta ao impulso é o kernel espelhado.
+    Com np.fft.fftshift vira a imagem do impulso.main (kernel no centro).
+    """
+    kernel = np.asarray(kernel, dtype=np.float64)
+    if kernel.ndim == 1:
+        kernel = kernel[None, :]
+    kh, kw = kernel.shape
+    altura, largura = forma
+    if kh > altura or kw > largura:
+        raise ValueError(f"Kernel {kernel.shape} maior que a grade {forma}.")
+    if out is None:
+        out = np.zeros(forma, dtype=np.float64)
+    else:
+        out.fill(0)
+
+    # h[n] = k[a - n] (a = âncora kh//2, kw//2, como no filter2D): o kernel
+    # espelhado começa em n = a - (k - 1), índices negativos dão a volta
+    linhas = (np.arange(kh) + kh // 2 - (kh - 1)) % altura
+    colunas = (np.arange(kw) + kw // 2 - (kw - 1)) % largura
+    out[np.ix_(linhas, colunas)] = kernel[::-1, ::-1]
+    return out
+
+
+def transferencias(kernels, forma=FORMA_PADRAO, workers=None, cache=None):
+    """
+    Funções de transferência H(u, v) de vários kernels (tamanhos diferentes
+    são aceitos) numa grade 'forma': array complexo (N, H, W//2 + 1) com a
+    metade não redundante do espectro (rfft2; o resto é a simetria hermitiana).
+
+    Os kernels que faltam no cache são posicionados numa única pilha e
+    transformados com UMA rfft2; os já calculados vêm do cache.
+    """
+    alvo = cache if cache is not None else CACHE_TRANSFERENCIAS
+    forma = tuple(forma)
+    kernels = [np.asarray(k, dtype=np.float64) for k in kernels]
+    chaves = [alvo.gerar_chave("resposta_frequencia.transferencia", (k,), {"forma": forma}) for k in kernels]
+
+    # Kernels repetidos na lista são calculados (e contados no cache) uma vez só
+    primeiro = {}
+    for i, chave in enumerate(chaves):
+        primeiro.setdefault(chave, i)
+
+    valores = {}
+    faltando = []
+    for chave in primeiro:
+        achou, valor = alvo.obter(chave)
+        if achou:
+            valores[chave] = valor
+        else:
+            faltando.append(chave)
+
+    if faltando:
+        pilha = np.empty((len(faltando),) + forma, dtype=np.float64)
+        for n, chave in enumerate(faltando):
+            posicionar(kernels[primeiro[chave]], forma, out=pilha[n])
+        meias = espectro.rfft2(pilha, workers=workers)
+        for n, chave in enumerate(faltando):
+            valores[chave] = alvo.guardar(chave, meias[n].copy())
+
+    saida = np.empty((len(kernels), forma[0], forma[1] // 2 + 1), dtype=np.complex128)
+    for i, chave in enumerate(chaves):
+        saida[i] = valores[chave]
+    return saida
+
+
+def transferencia(kernel, forma=FORMA_PADRAO, workers=None, cache=None):
+    """H(u, v) de um kernel: (H, W//2 + 1) complexo. Ver transferencias()."""
+    return transferencias([kernel], forma, workers, cache)[0]
+
+
+def espectro_log(meia, largura, epsilon=1e-5):
+    """
+    20 * log(|H| + epsilon) completo (H, W) e centralizado, a partir da
+    metade da rfft2 (aceita pilhas): a escala dos espectros do impulso.main
+    (epsilon 1e-5 evita log(0) nos zeros da resposta).
+    """
+    return espectro.expandir_espectro(espectro.log_magnitude(meia, epsilon), largura)
+
+
+# --- Respostas analíticas (mesma grade e mesma convenção da transferencia) ---
+
+@functools.lru_cache(maxsize=32)
+def frequencias(forma=FORMA_PADRAO):
+    """
+    (wy, wx) em radianos/pixel na grade da rfft2: wy com formato (H, 1),
+    wx com formato (1, W//2 + 1). Somente leitura (compartilhados).
+    """
+    altura, largura = forma
+    wy = 2 * np.pi * np.fft.fftfreq(altura)[:, None]
+    wx = 2 * np.pi * np.fft.rfftfreq(largura)[None, :]
+    wy.setflags(write=False)
+    wx.setflags(write=False)
+    return wy, wx
+
+
+def _impar(tamanho, nome):
+    if tamanho < 1 or tamanho % 2 == 0:
+        raise ValueError(f"'{nome}' deve ser ímpar (o centro do kernel precisa ser um pixel).")
+
+
+def _dirichlet(w, n):
+    # Média de n amostras centrada: sin(n w / 2) / (n sin(w / 2)), = 1 em w = 0
+    seno = np.sin(w / 2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        h = np.sin(n * w / 2) / (n * seno)
+    return np.where(np.abs(seno) < 1e-12, 1.0, h)
+
+
+def resposta_media(tamanho=5, forma=FORMA_PADRAO):
+    """Box blur tamanho x tamanho normalizado (cv2.blur): produto de dois núcleos de Dirichlet."""
+    _impar(tamanho, "tamanho")
+    wy, wx = frequencias(tuple(forma))
+    return (_dirichlet(wy, tamanho) * _dirichlet(wx, tamanho)).astype(np.complex128)
+
+
+def resposta_gaussiana(sigma, forma=FORMA_PADRAO):
+    """
+    Gaussiana contínua: exp(-sigma^2 (wx^2 + wy^2) / 2). É o limite do
+    cv2.getGaussianKernel quando o kernel cobre ~±3 sigma (sem truncar)
+    e sigma >~ 0.8 (sem aliasing); para kernels curtos, compare com
+    transferencia(kernel) para ver o efeito do truncamento.
+    """
+    wy, wx = frequencias(tuple(forma))
+    return np.exp(-(sigma ** 2) * (wx ** 2 + wy ** 2) / 2).astype(np.complex128)
+
+
+def resposta_laplaciano(vizinhos=4, forma=FORMA_PADRAO):
+    """
+    Laplaciano discreto, exato:
+    - 4 vizinhos [[0,1,0],[1,-4,1],[0,1,0]]: 2 cos wx + 2 cos wy - 4;
+    - 8 vizinhos [[1,1,1],[1,-8,1],[1,1,1]]: (1 + 2 cos wx)(1 + 2 cos wy) - 9.
+    """
+    wy, wx = frequencias(tuple(forma))
+    if vizinhos == 4:
+        h = 2 * np.cos(wx) + 2 * np.cos(wy) - 4
+    elif vizinhos == 8:
+        h = (1 + 2 * np.cos(wx)) * (1 + 2 * np.cos(wy)) - 9
+    else:
+        raise ValueError("'vizinhos' deve ser 4 ou 8.")
+    return h.astype(np.complex128)
+
+
+def resposta_sobel(dx=1, dy=0, ksize=3, forma=FORMA_PADRAO):
+    """
+    Sobel do OpenCV (cv2.Sobel / getDerivKernels, 1ª derivada), exato para
+    qualquer ksize ímpar: em cada eixo o kernel é binomial de ordem ksize - 1,
+    - suavização: (2 cos(w/2))^(ksize-1);
+    - derivada:   (2 cos(w/2))^(ksize-2) * 2j sin(w/2)  (ksize=3: 2j sin w).
+    """
+    _impar(ksize, "ksize")
+    if (dx, dy) not in ((1, 0), (0, 1)) or ksize < 3:
+        raise ValueError("Só a 1ª derivada (dx, dy) = (1, 0) ou (0, 1) com ksize >= 3.")
+    wy, wx = frequencias(tuple(forma))
+
+    def suavizacao(w):
+        return (2 * np.cos(w / 2)) ** (ksize - 1)
+
+    def derivada(w):
+        return (2 * np.cos(w / 2)) ** (ksize - 2) * 2j * np.sin(w / 2)
+
+    if dx == 1:
+        return derivada(wx) * suavizacao(wy)
+    return suavizacao(wx) * derivada(wy)
@@ -0,0 +1,213 @@
+import argparse
+import os
+import time
+
+import cv2
+import numpy as np
+
+from lote import listar_imagens
+
+TIPOS = ("sal_pimenta", "gaussiano", "poisson", "speckle")
+
+# Elementos por bloco: o float32 temporário tem 4 MB, não o tamanho da pilha
+BLOCO = 1 << 20
+
+# Acima desta média (em fótons) o Poisson é trocado pela Normal(lam, sqrt(lam)):
+# assimetria 1/sqrt(lam) < 0.15, e o rng.poisson é ~5x mais lento que a Normal
+LIMIAR_POISSON = 50.0
+
+
+def gerador(semente=None):
+    """np.random.Generator a partir de uma semente (um Generator é devolvido como está)."""
+    return np.random.default_rng(semente)
+
+
+def geradores(semente, quantidade):
+    """
+    'quantidade' Generators independentes e reprodutíveis (SeedSequence.spawn):
+    um por imagem/processo, para gerar um dataset em paralelo com o mesmo
+    resultado da geração em série.
+    """
+    return [np.random.default_rng(s) for s in np.random.SeedSequence(semente).spawn(quantidade)]
+
+
+def faixa_padrao(dtype):
+    """(mínimo, máximo) dos valores: o do tipo inteiro, ou 0-1 para float."""
+    dtype = np.dtype(dtype)
+    if np.issubdtype(dtype, np.integer):
+        info = np.iinfo(dtype)
+        return float(info.min), float(info.max)
+    if np.issubdtype(dtype, np.floating):
+        return 0.0, 1.0
+    raise ValueError(f"Tipo '{dtype}' não suportado (use uint8, uint16 ou float).")
+
+
+def _plano(imagem):
+    # Visão 1D da imagem (ou pilha): o ruído é por elemento, a forma não importa
+    if not isinstance(imagem, np.ndarray) or not imagem.flags.writeable:
+        raise ValueError("O ruído é aplicado in-place: passe um np.ndarray gravável.")
+    if not imagem.flags.c_contiguous:
+        raise ValueError("A imagem precisa ser contígua (use np.ascontiguousarray).")
+    return imagem.reshape(-1)
+
+
+def _blocos(plano, bloco):
+    for inicio in range(0, plano.size, bloco):
+        yield plano[inicio:inicio + bloco]
+
+
+def _gravar(destino, valores, faixa):
+    # Satura na faixa; nos inteiros arredonda antes da conversão
+    np.clip(valores, faixa[0], faixa[1], out=valores)
+    if np.issubdtype(destino.dtype, np.integer):
+        np.rint(valores, out=valores)
+    np.copyto(destino, valores, casting="unsafe")
+
+
+def sal_pimenta(imagem, quantidade=0.05, proporcao_sal=0.5, faixa=None, rng=None):
+    """
+    Cada elemento vira, com probabilidade 'quantidade', o máximo da faixa
+    (sal, com probabilidade 'proporcao_sal') ou o mínimo (pimenta). In-place.
+
+    Só os ~quantidade*N elementos atingidos são sorteados (não N números):
+    K ~ Poisson(N * -ln(1 - quantidade)) posições uniformes com repetição
+    deixam cada elemento atingido com probabilidade exata 'quantidade',
+    independente dos demais.
+    """
+    if not 0.0 <= quantidade <= 1.0:
+        raise ValueError("'quantidade' deve estar entre 0 e 1.")
+    rng = gerador(rng)
+    plano = _plano(imagem)
+    baixo, alto = faixa or faixa_padrao(imagem.dtype)
+    if quantidade == 1.0:
+        sal = rng.random(plano.size, dtype=np.float32) < proporcao_sal
+        plano[:] = np.where(sal, alto, baixo)
+        return imagem
+
+    atingidos = rng.poisson(plano.size * -np.log1p(-quantidade))
+    posicoes = rng.integers(0, plano.size, atingidos)
+    sal = rng.random(atingidos, dtype=np.float32) < proporcao_sal
+    plano[posicoes] = np.where(sal, alto, baixo)
+    return imagem
+
+
+def gaussiano(imagem, desvio, media=0.0, faixa=None, rng=None, bloco=BLOCO):
+    """Soma Normal(media, desvio) a cada elemento, saturando na faixa. In-place."""
+    rng = gerador(rng)
+    faixa = faixa or faixa_padrao(imagem.dtype)
+    temp = np.empty(min(bloco, imagem.size), dtype=np.float32)
+    for parte in _blocos(_plano(imagem), bloco):
+        valores = temp[:parte.size]
+        rng.standard_normal(out=valores, dtype=np.float32)
+        valores *= np.float32(desvio)
+        valores += np.float32(media)
+        valores += parte
+        _gravar(parte, valores, faixa)
+    return imagem
+
+
+def speckle(imagem, desvio, faixa=None, rng=None, bloco=BLOCO):
+    """Ruído multiplicativo: x + x * Normal(0, desvio), saturando na faixa. In-place."""
+    rng = gerador(rng)
+    faixa = faixa or faixa_padrao(imagem.dtype)
+    temp = np.empty(min(bloco, imagem.size), dtype=np.float32)
+    for parte in _blocos(_plano(imagem), bloco):
+        valores = temp[:parte.size]
+        rng.standard_normal(out=valores, dtype=np.float32)
+        valores *= np.float32(desvio)
+        valores += 1
+        valores *= parte
+        _gravar(parte, valores, faixa)
+    return imagem
+
+
+def poisson(imagem, escala=None, faixa=None, rng=None, bloco=BLOCO, limiar=LIMIAR_POISSON):
+    """
+    Ruído de fóton: cada elemento x vira Poisson(x * escala) / escala. In-place.
+
+    'escala' = fótons por unidade de intensidade (padrão: 1 nos inteiros, o
+    valor do pixel é a contagem; 255 no float 0-1). Quanto menor, mais ruído.
+    Médias acima de 'limiar' usam a aproximação Normal(lam, sqrt(lam));
+    limiar=None sorteia Poisson exato em todos os elementos.
+    """
+    rng = gerador(rng)
+    faixa = faixa or faixa_padrao(imagem.dtype)
+    if escala is None:
+        escala = 1.0 if np.issubdtype(imagem.dtype, np.integer) else 255.0 / faixa[1]
+    temp = np.empty(min(bloco, imagem.size), dtype=np.float32)
+    ruido = np.empty_like(temp)
+    for parte in _blocos(_plano(imagem), bloco):
+        lam = temp[:parte.size]
+        np.multiply(parte, np.float32(escala), out=lam, casting="unsafe")
+        np.maximum(lam, 0, out=lam)
+        if limiar is None:
+            lam[:] = rng.poisson(lam)
+        else:
+            # Normal nos elementos claros (a maioria), Poisson exato nos escuros
+            escuros = np.flatnonzero(lam < limiar)
+            pequenos = rng.poisson(lam[escuros])
+            z = ruido[:parte.size]
+            rng.standard_normal(out=z, dtype=np.float32)
+            z *= np.sqrt(lam)
+            lam += z
+            lam[escuros] = pequenos
+        lam /= np.float32(escala)
+        _gravar(parte, lam, faixa)
+    return imagem
+
+
+def aplicar(imagem, tipo, nivel, rng=None, **opcoes):
+    """
+    Um dos TIPOS com um só 'nivel' (para varrer intensidades):
+    sal_pimenta -> fração atingida; gaussiano -> desvio (nas unidades da imagem);
+    poisson -> fótons por unidade; speckle -> desvio relativo.
+    """
+    if tipo == "sal_pimenta":
+        return sal_pimenta(imagem, nivel, rng=rng, **opcoes)
+    if tipo == "gaussiano":
+        return gaussiano(imagem, nivel, rng=rng, **opcoes)
+    if tipo == "poisson":
+        return poisson(imagem, nivel, rng=rng, **opcoes)
+    if tipo == "speckle":
+        return speckle(imagem, nivel, rng=rng, **opcoes)
+    raise ValueError(f"Tipo de ruído '{tipo}' inválido. Use um de {TIPOS}.")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Gera versões ruidosas (reprodutíveis) de imagens.")
+    parser.add_argument("entrada", help="Arquivo, diretório ou padrão glob (entre aspas) de imagens")
+    parser.add_argument("saida", help="Diretório onde gravar as imagens ruidosas")
+    parser.add_argument("-t", "--tipo", choices=TIPOS, default="gaussiano")
+    parser.add_argument("-n", "--nivel", type=float, default=20.0, help="Intensidade (ver ruido.aplicar)")
+    parser.add_argument("-c", "--copias", type=int, default=1, help="Versões ruidosas por imagem")
+    parser.add_argument("-s", "--semente", type=int, default=0)
+    parser.add_argument("--cinza", action="store_true", help="Converte para tons de cinza antes")
+    args = parser.parse_args()
+
+    caminhos = sorted(listar_imagens(args.entrada))
+    os.makedirs(args.saida, exist_ok=True)
+    # Um gerador por (imagem, cópia): o resultado não depende da ordem nem de quantas rodam
+    rngs = geradores(args.semente, len(caminhos) * args.copias)
+
+    gravadas = 0
+    tempo_ruido = 0.0
+    inicio = time.perf_counter()
+    for i, caminho in enumerate(caminhos):
+        img = cv2.imread(caminho, cv2.IMREAD_GRAYSCALE if args.cinza else cv2.IMREAD_COLOR)
+        if img is None:
+            print(f"Erro ao carregar '{caminho}'.")
+            continue
+        nome = os.path.splitext(os.path.basename(caminho))[0]
+        for copia in range(args.copias):
+            t = time.perf_counter()
+            ruidosa = aplicar(img.copy(), args.tipo, args.nivel, rng=rngs[i * args.copias + copia])
+            tempo_ruido += time.perf_counter() - t
+            cv2.imwrite(os.path.join(args.saida, f"{nome}_{args.tipo}_{copia:04d}.png"), ruidosa)
+            gravadas += 1
+
+    total = time.perf_counter() - inicio
+    print(f"{gravadas} imagens em {total:.2f} s ({tempo_ruido:.2f} s gerando ruído)")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,363 @@
+import argparse
+import asyncio
+import io
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+import cv2
+import numpy as np
+
+# Os scripts da pasta kernels/ importam uns aos outros pelo nome
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "kernels"))
+
+import espectro
+import main
+from canny import tamanho_kernel_impar
+
+OPERACOES = ("sobel", "prewitt", "canny", "fft")
+FORMATOS = ("png", "npy")
+MOTIVOS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class ErroRequisicao(Exception):
+    """Erro que vira uma resposta HTTP com o 'status' dado."""
+
+    def __init__(self, status, mensagem):
+        super().__init__(mensagem)
+        self.status = status
+
+
+# ---------------------------------------------------------------------------
+# Processamento (roda nas threads do pool: o OpenCV e a FFT liberam o GIL)
+# ---------------------------------------------------------------------------
+
+def decodificar(corpo):
+    """Bytes de PNG/JPEG/... ou de um .npy -> imagem em escala de cinza."""
+    if corpo.startswith(b"\x93NUMPY"):
+        try:
+            imagem = np.load(io.BytesIO(corpo), allow_pickle=False)
+            if imagem.ndim == 3 and imagem.shape[2] in (3, 4):
+                imagem = cv2.cvtColor(imagem, cv2.COLOR_BGR2GRAY if imagem.shape[2] == 3 else cv2.COLOR_BGRA2GRAY)
+        except (ValueError, EOFError, OSError, cv2.error) as erro:
+            # .npy truncado, corrompido ou de um tipo que o OpenCV não aceita
+            raise ErroRequisicao(400, f"Arquivo .npy inválido: {str(erro).strip()}")
+    else:
+        imagem = cv2.imdecode(np.frombuffer(corpo, dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+    if imagem is None or imagem.ndim != 2:
+        raise ErroRequisicao(400, "Corpo não é uma imagem válida (PNG/JPEG/... ou .npy 2D).")
+    return imagem
+
+
+def codificar(resultado, formato):
+    """Resultado -> (content-type, bytes). Em PNG o float é normalizado para 0-255."""
+    if formato == "npy":
+        buffer = io.BytesIO()
+        np.save(buffer, resultado, allow_pickle=False)
+        return "application/x-npy", buffer.getvalue()
+    if resultado.dtype != np.uint8:
+        resultado = cv2.normalize(resultado, None, 0, 255, cv2.NORM_MINMAX, cv2.CV_8U)
+    ok, png = cv2.imencode(".png", resultado)
+    if not ok:
+        raise ErroRequisicao(500, "Falha ao codificar o PNG.")
+    return "image/png", png.tobytes()
+
+
+def aplicar_canny(imagem, blur=5, minimo=50, maximo=150):
+    """Blur + Canny como em kernels/canny.py (o Canny exige 8 bits)."""
+    if imagem.dtype != np.uint8:
+        imagem = cv2.normalize(imagem, None, 0, 255, cv2.NORM_MINMAX, cv2.CV_8U)
+    kernel_size = tamanho_kernel_impar(blur)
+    return cv2.Canny(cv2.GaussianBlur(imagem, (kernel_size, kernel_size), 0), minimo, maximo)
+
+
+def _parametros_canny(parametros):
+    try:
+        return {"blur": int(parametros.get("blur", 5)),
+                "minimo": int(parametros.get("min", 50)),
+                "maximo": int(parametros.get("max", 150))}
+    except ValueError:
+        raise ErroRequisicao(400, "Parâmetros do Canny (blur, min, max) devem ser inteiros.")
+
+
+def _processar_um(operacao, parametros, imagem):
+    # Versões sem o cache do main: cada requisição traz uma imagem nova,
+    # e o hash + a cópia guardada custariam mais que o próprio filtro
+    if operacao == "sobel":
+        return main.aplicar_filtro_sobel.__wrapped__(imagem)
+    if operacao == "prewitt":
+        return main.aplicar_filtro_prewitt_manual(imagem)
+    if operacao == "canny":
+        return aplicar_canny(imagem, **_parametros_canny(parametros))
+    return main.calcular_fft.__wrapped__(imagem)
+
+
+def processar_lote(pedidos):
+    """
+    Processa um micro-lote de pedidos (operacao, parametros, corpo, formato).
+    Os pedidos de FFT com imagens do mesmo tamanho viram UMA rfft2 em lote.
+    Retorna, na mesma ordem, (content-type, bytes) ou a ErroRequisicao de cada um:
+    um pedido com problema não derruba os outros do lote.
+    """
+    respostas = [None] * len(pedidos)
+    imagens = [None] * len(pedidos)
+    for i, (_, _, corpo, _) in enumerate(pedidos):
+        try:
+            imagens[i] = decodificar(corpo)
+        except ErroRequisicao as erro:
+            respostas[i] = erro
+        except Exception as erro:
+            respostas[i] = ErroRequisicao(400, f"Corpo não é uma imagem válida: {str(erro).strip()}")
+
+    # FFTs agrupadas por forma da imagem
+    grupos_fft = {}
+    for i, (operacao, _, _, _) in enumerate(pedidos):
+        if operacao == "fft" and respostas[i] is None:
+            grupos_fft.setdefault(imagens[i].shape, []).append(i)
+    resultados = {}
+    for indices in grupos_fft.values():
+        if len(indices) > 1:
+            # Mesmos parâmetros do main.calcular_fft. Se a FFT em lote falhar,
+            # cada pedido do grupo é refeito sozinho abaixo e recebe o próprio erro
+            try:
+                espectros = espectro.calcular_espectros_lote([imagens[i] for i in indices],
+                                                             precisao=np.float32, epsilon=1)
+            except Exception:
+                continue
+            resultados.update(zip(indices, espectros))
+
+    for i, (operacao, parametros, _, formato) in enumerate(pedidos):
+        if respostas[i] is not None:
+            continue
+        try:
+            resultado = resultados[i] if i in resultados else _processar_um(operacao, parametros, imagens[i])
+            respostas[i] = codificar(resultado, formato)
+        except ErroRequisicao as erro:
+            respostas[i] = erro
+        except cv2.error as erro:
+            respostas[i] = ErroRequisicao(400, f"OpenCV: {str(erro).strip()}")
+        except Exception as erro:
+            respostas[i] = ErroRequisicao(500, f"Erro interno: {type(erro).__name__}: {erro}")
+    return respostas
+
+
+# ---------------------------------------------------------------------------
+# Servidor HTTP (asyncio puro, sem dependências externas)
+# ---------------------------------------------------------------------------
+
+class Metricas:
+    """Latências recentes por operação (janela de 'janela' requisições)."""
+
+    def __init__(self, janela=1000):
+        self.latencias = {operacao: deque(maxlen=janela) for operacao in OPERACOES}
+        self.contagem = {operacao: 0 for operacao in OPERACOES}
+        self.rejeitadas = 0
+        self.erros = 0
+        self.lotes = 0
+        self.pedidos_em_lotes = 0
+
+    def registrar(self, operacao, segundos):
+        self.latencias[operacao].append(segundos)
+        self.contagem[operacao] += 1
+
+    def resumo(self, pendentes):
+        resumo = {"pendentes": pendentes, "rejeitadas": self.rejeitadas, "erros": self.erros,
+                  "lotes": self.lotes,
+                  "tamanho_medio_lote": self.pedidos_em_lotes / self.lotes if self.lotes else 0.0,
+                  "operacoes": {}}
+        for operacao, valores in self.latencias.items():
+            item = {"requisicoes": self.contagem[operacao]}
+            if valores:
+                ms = np.array(valores) * 1000
+                item["p50_ms"] = float(np.percentile(ms, 50))
+                item["p99_ms"] = float(np.percentile(ms, 99))
+            resumo["operacoes"][operacao] = item
+        return resumo
+
+
+class Servidor:
+    """
+    Recebe POST /<operacao>?formato=png|npy com os bytes da imagem no corpo.
+
+    - Micro-lotes: os pedidos que chegam dentro de 'espera_lote' segundos
+      (até 'lote_max') vão juntos para o pool de threads, numa tarefa só.
+    - Contrapressão: com 'max_pendentes' pedidos em andamento, os novos
+      recebem 503 na hora (com Retry-After) em vez de esperar sem limite.
+    - GET /metricas: p50/p99 por operação, rejeições e tamanho médio dos lotes.
+    """
+
+    def __init__(self, trabalhadores=None, lote_max=8, espera_lote=0.005, max_pendentes=64,
+                 max_bytes=50 * 1024 * 1024):
+        self.executor = ThreadPoolExecutor(max_workers=trabalhadores or os.cpu_count() or 1)
+        self.lote_max = lote_max
+        self.espera_lote = espera_lote
+        self.max_pendentes = max_pendentes
+        self.max_bytes = max_bytes
+        self.metricas = Metricas()
+        self.pendentes = 0
+        self.fila = None
+        self.tarefas = set()
+
+    async def iniciar(self, host="127.0.0.1", porta=8080):
+        self.fila = asyncio.Queue()
+        self.tarefas.add(asyncio.create_task(self._agrupar()))
+        return await asyncio.start_server(self._atender, host, porta)
+
+    # --- Micro-lotes ---
+
+    async def _agrupar(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            lote = [await self.fila.get()]
+            prazo = loop.time() + self.espera_lote
+            while len(lote) < self.lote_max:
+                restante = prazo - loop.time()
+                if restante <= 0:
+                    break
+                try:
+                    lote.append(await asyncio.wait_for(self.fila.get(), restante))
+                except asyncio.TimeoutError:
+                    break
+            # Não espera o lote terminar: vários lotes rodam em paralelo no pool
+            tarefa = asyncio.create_task(self._despachar(lote))
+            self.tarefas.add(tarefa)
+            tarefa.add_done_callback(self.tarefas.discard)
+
+    async def _despachar(self, lote):
+        self.metricas.lotes += 1
+        self.metricas.pedidos_em_lotes += len(lote)
+        pedidos = [pedido for pedido, _ in lote]
+        try:
+            respostas = await asyncio.get_running_loop().run_in_executor(self.executor, processar_lote, pedidos)
+        except Exception as erro:
+            respostas = [ErroRequisicao(500, f"Erro interno: {erro}")] * len(lote)
+        for (_, futuro), resposta in zip(lote, respostas):
+            if not futuro.done():
+                futuro.set_result(resposta)
+
+    async def processar(self, operacao, parametros, corpo, formato):
+        if self.pendentes >= self.max_pendentes:
+            self.metricas.rejeitadas += 1
+            raise ErroRequisicao(503, "Servidor ocupado, tente novamente.")
+        self.pendentes += 1
+        try:
+            futuro = asyncio.get_running_loop().create_future()
+            await self.fila.put(((operacao, parametros, corpo, formato), futuro))
+            resposta = await futuro
+        finally:
+            self.pendentes -= 1
+        if isinstance(resposta, ErroRequisicao):
+            raise resposta
+        return resposta
+
+    # --- HTTP ---
+
+    async def _rotear(self, metodo, alvo, corpo):
+        url = urlsplit(alvo)
+        caminho = url.path.strip("/")
+        parametros = {chave: valores[-1] for chave, valores in parse_qs(url.query).items()}
+
+        if caminho == "metricas":
+            if metodo != "GET":
+                raise ErroRequisicao(405, "Use GET.")
+            dados = json.dumps(self.metricas.resumo(self.pendentes), indent=2).encode()
+            return "application/json", dados
+        if caminho not in OPERACOES:
+            raise ErroRequisicao(404, f"Operação '{caminho}' inexistente. Use uma de {OPERACOES}.")
+        if metodo != "POST":
+            raise ErroRequisicao(405, "Envie a imagem com POST.")
+        formato = parametros.get("formato", "png")
+        if formato not in FORMATOS:
+            raise ErroRequisicao(400, f"Formato '{formato}' inválido. Use um de {FORMATOS}.")
+        if not corpo:
+            raise ErroRequisicao(400, "Corpo vazio: envie os bytes da imagem.")
+
+        inicio = time.perf_counter()
+        resposta = await self.processar(caminho, parametros, corpo, formato)
+        self.metricas.registrar(caminho, time.perf_counter() - inicio)
+        return resposta
+
+    async def _atender(self, leitor, escritor):
+        try:
+            while True:
+                linha = await leitor.readline()
+                if not linha:
+                    break
+                metodo, alvo, versao = linha.decode("latin-1").split()
+                cabecalhos = {}
+                while True:
+                    cabecalho = await leitor.readline()
+                    if cabecalho in (b"\r\n", b"\n", b""):
+                        break
+                    chave, valor = cabecalho.decode("latin-1").split(":", 1)
+                    cabecalhos[chave.strip().lower()] = valor.strip()
+
+                tamanho = int(cabecalhos.get("content-length", 0))
+                manter = versao == "HTTP/1.1" and cabecalhos.get("connection", "").lower() != "close"
+                if tamanho > self.max_bytes:
+                    # O corpo não é lido: a conexão precisa ser fechada
+                    await self._responder(escritor, 413, "text/plain", b"Imagem grande demais.", False)
+                    break
+                corpo = await leitor.readexactly(tamanho) if tamanho else b""
+
+                try:
+                    tipo, dados = await self._rotear(metodo, alvo, corpo)
+                    status = 200
+                except ErroRequisicao as erro:
+                    status, tipo, dados = erro.status, "text/plain; charset=utf-8", str(erro).encode()
+                    if status != 503:
+                        self.metricas.erros += 1
+                await self._responder(escritor, status, tipo, dados, manter)
+                if not manter:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            escritor.close()
+
+    async def _responder(self, escritor, status, tipo, dados, manter):
+        cabecalhos = [f"HTTP/1.1 {status} {MOTIVOS.get(status, '')}",
+                      f"Content-Type: {tipo}",
+                      f"Content-Length: {len(dados)}",
+                      f"Connection: {'keep-alive' if manter else 'close'}"]
+        if status == 503:
+            cabecalhos.append("Retry-After: 1")
+        escritor.write(("\r\n".join(cabecalhos) + "\r\n\r\n").encode("latin-1") + dados)
+        await escritor.drain()
+
+
+async def servir(host, porta, **opcoes):
+    servidor = Servidor(**opcoes)
+    tcp = await servidor.iniciar(host, porta)
+    print(f"Servindo em http://{host}:{porta} (operações: {', '.join(OPERACOES)}; métricas em /metricas)")
+    async with tcp:
+        await tcp.serve_forever()
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Serviço HTTP local para os filtros de borda e espectros.")
+    parser.add_argument("--host", default="127.0.0.1", help="Endereço (padrão: só a máquina local)")
+    parser.add_argument("--porta", type=int, default=8080)
+    parser.add_argument("-t", "--trabalhadores", type=int, default=None,
+                        help="Threads de processamento (padrão: número de núcleos)")
+    parser.add_argument("--lote-max", type=int, default=8, help="Máximo de pedidos por micro-lote")
+    parser.add_argument("--espera-lote-ms", type=float, default=5.0,
+                        help="Quanto esperar por mais pedidos antes de fechar um lote")
+    parser.add_argument("--max-pendentes", type=int, default=64,
+                        help="Pedidos em andamento acima dos quais responde 503")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(servir(args.host, args.porta, trabalhadores=args.trabalhadores, lote_max=args.lote_max,
+                           espera_lote=args.espera_lote_ms / 1000, max_pendentes=args.max_pendentes))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,350 @@
+import argparse
+import os
+import queue
+import threading
+import time
+
+import cv2
+import numpy as np
+
+import espectro
+import gradientes
+from lote import listar_imagens
+
+EXTENSOES_VIDEO = (".mp4", ".avi", ".mov", ".mkv")
+
+# O que fazer quando o processamento não acompanha a leitura (fila cheia):
+# - "fila": o leitor espera (nenhum quadro é perdido, a leitura desacelera);
+# - "descartar_novo": o quadro recém-lido é descartado;
+# - "descartar_antigo": sai o quadro mais velho da fila, entra o novo (menor latência).
+POLITICAS = ("fila", "descartar_novo", "descartar_antigo")
+
+# Marca de fim do fluxo nas filas
+_FIM = None
+
+
+def ler_quadros(entrada):
+    """
+    Gera os quadros BGR de um arquivo de vídeo ou de uma sequência de imagens
+    (diretório ou padrão glob, em ordem alfabética).
+    """
+    if os.path.isfile(entrada) and entrada.lower().endswith(EXTENSOES_VIDEO):
+        captura = cv2.VideoCapture(entrada)
+        if not captura.isOpened():
+            raise ValueError(f"Não foi possível abrir o vídeo '{entrada}'.")
+        try:
+            while True:
+                ok, quadro = captura.read()
+                if not ok:
+                    break
+                yield quadro
+        finally:
+            captura.release()
+    else:
+        for caminho in sorted(listar_imagens(entrada)):
+            quadro = cv2.imread(caminho)
+            if quadro is not None:
+                yield quadro
+
+
+def fps_origem(entrada, padrao=30.0):
+    if os.path.isfile(entrada) and entrada.lower().endswith(EXTENSOES_VIDEO):
+        captura = cv2.VideoCapture(entrada)
+        fps = captura.get(cv2.CAP_PROP_FPS)
+        captura.release()
+        if fps > 0:
+            return fps
+    return padrao
+
+
+class Estatisticas:
+    """Latências (s) por estágio, acumuladas pelas threads com um lock."""
+
+    ESTAGIOS = ("leitura", "processamento", "escrita", "total")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencias = {estagio: [] for estagio in self.ESTAGIOS}
+        self.lidos = 0
+        self.descartados = 0
+        self.escritos = 0
+        self.inicio = time.perf_counter()
+        self.fim = None
+
+    def registrar(self, estagio, segundos):
+        with self.lock:
+            self.latencias[estagio].append(segundos)
+
+    def contar(self, campo):
+        with self.lock:
+            setattr(self, campo, getattr(self, campo) + 1)
+
+    def resumo(self):
+        decorrido = (self.fim or time.perf_counter()) - self.inicio
+        resumo = {
+            "lidos": self.lidos,
+            "descartados": self.descartados,
+            "escritos": self.escritos,
+            "decorrido_s": decorrido,
+            "fps": self.escritos / decorrido if decorrido > 0 else 0.0,
+        }
+        for estagio, valores in self.latencias.items():
+            if valores:
+                ms = np.array(valores) * 1000
+                resumo[estagio] = {"media_ms": float(ms.mean()),
+                                   "p50_ms": float(np.percentile(ms, 50)),
+                                   "p95_ms": float(np.percentile(ms, 95))}
+        return resumo
+
+
+class ProcessadorQuadros:
+    """
+    Pipeline do main.main para um quadro: cinza -> GaussianBlur 3x3 ->
+    Sobel (normalizado 0-255) + espectro log da FFT.
+    Os buffers do tamanho do quadro são criados uma vez e reaproveitados;
+    só o mosaico de saída é novo a cada quadro (ele segue para outra thread).
+    """
+
+    def __init__(self, com_espectro=True):
+        self.com_espectro = com_espectro
+        self.espaco = None
+        self.cinza = None
+        self.suave = None
+
+    def _preparar(self, forma):
+        if self.espaco is None or self.espaco.forma != forma:
+            self.espaco = gradientes.EspacoTrabalho(forma)
+            self.cinza = np.empty(forma, dtype=np.uint8)
+            self.suave = np.empty(forma, dtype=np.uint8)
+
+    def __call__(self, quadro):
+        self._preparar(quadro.shape[:2])
+        cv2.cvtColor(quadro, cv2.COLOR_BGR2GRAY, dst=self.cinza)
+        cv2.GaussianBlur(self.cinza, (3, 3), 0, dst=self.suave)
+        bordas = gradientes.bordas_sobel(self.suave, self.espaco)
+
+        if not self.com_espectro:
+            return bordas.copy()
+
+        espectro_log = espectro.calcular_espectro(self.suave, precisao=np.float32)
+        espectro_u8 = cv2.normalize(espectro_log, None, 0, 255, cv2.NORM_MINMAX, cv2.CV_8U)
+        return np.hstack([bordas, espectro_u8])
+
+
+class EscritorQuadros:
+    """Grava num vídeo (pela extensão) ou como PNGs numerados num diretório."""
+
+    def __init__(self, saida, fps):
+        self.saida = saida
+        self.fps = fps
+        self.video = None
+        self.indice = 0
+        if not saida.lower().endswith(EXTENSOES_VIDEO):
+            os.makedirs(saida, exist_ok=True)
+
+    def escrever(self, quadro):
+        if self.saida.lower().endswith(EXTENSOES_VIDEO):
+            if self.video is None:
+                altura, largura = quadro.shape[:2]
+                codec = cv2.VideoWriter_fourcc(*"mp4v")
+                self.video = cv2.VideoWriter(self.saida, codec, self.fps, (largura, altura))
+            self.video.write(cv2.cvtColor(quadro, cv2.COLOR_GRAY2BGR))
+        else:
+            cv2.imwrite(os.path.join(self.saida, f"quadro_{self.indice:06d}.png"), quadro)
+        self.indice += 1
+
+    def fechar(self):
+        if self.video is not None:
+            self.video.release()
+
+
+def _colocar(fila, item, politica, estatisticas, parar):
+    """Põe 'item' na fila seguindo a política; devolve False se ele foi descartado."""
+    if politica == "fila":
+        while not parar.is_set():
+            try:
+                fila.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    try:
+        fila.put_nowait(item)
+        return True
+    except queue.Full:
+        pass
+    if politica == "descartar_novo":
+        estatisticas.contar("descartados")
+        return False
+
+    # descartar_antigo: abre espaço tirando o mais velho
+    try:
+        fila.get_nowait()
+        estatisticas.contar("descartados")
+    except queue.Empty:
+        pass
+    try:
+        fila.put_nowait(item)
+        return True
+    except queue.Full:
+        estatisticas.contar("descartados")
+        return False
+
+
+def _sinalizar_fim(fila, parar):
+    """
+    Põe o _FIM na fila (ele nunca é descartado). Se o pipeline está parando,
+    quem consome a fila pode ter morrido: esvazia-a para o _FIM caber.
+    """
+    while True:
+        try:
+            fila.put(_FIM, timeout=0.1)
+            return
+        except queue.Full:
+            if parar.is_set():
+                try:
+                    fila.get_nowait()
+                except queue.Empty:
+                    pass
+
+
+def _falhar(erros, erro, parar):
+    # Guarda o erro para o processar_fluxo relançar e derruba os outros estágios
+    erros.append(erro)
+    parar.set()
+
+
+def _leitor(entrada, fila, politica, estatisticas, parar, erros):
+    try:
+        quadros = ler_quadros(entrada)
+        while not parar.is_set():
+            inicio = time.perf_counter()
+            quadro = next(quadros, _FIM)
+            if quadro is _FIM:
+                break
+            estatisticas.registrar("leitura", time.perf_counter() - inicio)
+            estatisticas.contar("lidos")
+            # O instante da leitura viaja com o quadro: latência ponta a ponta
+            _colocar(fila, (inicio, quadro), politica, estatisticas, parar)
+    except BaseException as erro:
+        _falhar(erros, erro, parar)
+    finally:
+        _sinalizar_fim(fila, parar)
+
+
+def _processador(fila_entrada, fila_saida, processar, estatisticas, parar, erros):
+    try:
+        while True:
+            item = fila_entrada.get()
+            if item is _FIM:
+                break
+            if parar.is_set():
+                continue  # Só esvazia a fila, para o leitor não travar
+            lido_em, quadro = item
+            inicio = time.perf_counter()
+            resultado = processar(quadro)
+            estatisticas.registrar("processamento", time.perf_counter() - inicio)
+            # Depois do processamento não se descarta nada: só espera o escritor
+            _colocar(fila_saida, (lido_em, resultado), "fila", estatisticas, parar)
+    except BaseException as erro:
+        _falhar(erros, erro, parar)
+    finally:
+        _sinalizar_fim(fila_saida, parar)
+
+
+def _escritor(fila, escritor, estatisticas, parar, erros):
+    try:
+        while True:
+            item = fila.get()
+            if item is _FIM:
+                break
+            lido_em, resultado = item
+            inicio = time.perf_counter()
+            escritor.escrever(resultado)
+            fim = time.perf_counter()
+            estatisticas.registrar("escrita", fim - inicio)
+            estatisticas.registrar("total", fim - lido_em)
+            estatisticas.contar("escritos")
+    except BaseException as erro:
+        _falhar(erros, erro, parar)
+    finally:
+        escritor.fechar()
+
+
+def processar_fluxo(entrada, saida, politica="fila", tamanho_fila=8, fps=None, com_espectro=True):
+    """
+    Lê, processa e grava os quadros em três threads ligadas por filas
+    limitadas ('tamanho_fila' quadros cada): a decodificação do próximo
+    quadro e a gravação do anterior acontecem durante o processamento do atual
+    (o OpenCV e a FFT liberam o GIL).
+
+    Retorna o resumo de Estatisticas: FPS sustentado, quadros lidos,
+    descartados e escritos e a latência (média, p50, p95) de cada estágio.
+    Se um estágio falha, os outros param e o erro é relançado aqui.
+    """
+    if politica not in POLITICAS:
+        raise ValueError(f"Política '{politica}' inválida. Use uma de {POLITICAS}.")
+
+    estatisticas = Estatisticas()
+    parar = threading.Event()
+    erros = []
+    fila_entrada = queue.Queue(maxsize=tamanho_fila)
+    fila_saida = queue.Queue(maxsize=tamanho_fila)
+    escritor = EscritorQuadros(saida, fps or fps_origem(entrada))
+
+    threads = [
+        threading.Thread(target=_leitor, args=(entrada, fila_entrada, politica, estatisticas, parar, erros),
+                         name="leitor"),
+        threading.Thread(target=_processador,
+                         args=(fila_entrada, fila_saida, ProcessadorQuadros(com_espectro), estatisticas, parar, erros),
+                         name="processador"),
+        threading.Thread(target=_escritor, args=(fila_saida, escritor, estatisticas, parar, erros),
+                         name="escritor"),
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        for thread in threads:
+            thread.join()
+    except KeyboardInterrupt:
+        parar.set()
+        for thread in threads:
+            thread.join()
+
+    estatisticas.fim = time.perf_counter()
+    if erros:
+        raise erros[0]
+    return estatisticas.resumo()
+
+
+def imprimir_resumo(resumo):
+    print(f"{resumo['escritos']} quadros gravados de {resumo['lidos']} lidos "
+          f"({resumo['descartados']} descartados) em {resumo['decorrido_s']:.2f} s "
+          f"-> {resumo['fps']:.1f} FPS")
+    for estagio in Estatisticas.ESTAGIOS:
+        if estagio in resumo:
+            r = resumo[estagio]
+            print(f"  {estagio:14s} média {r['media_ms']:8.2f} ms | p50 {r['p50_ms']:8.2f} ms "
+                  f"| p95 {r['p95_ms']:8.2f} ms")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(
+        description="Sobel + espectro da FFT em um vídeo ou sequência de imagens, em threads.")
+    parser.add_argument("entrada", help="Arquivo de vídeo, diretório ou padrão glob (entre aspas) de imagens")
+    parser.add_argument("saida", help="Vídeo de saída (.mp4/.avi/...) ou diretório para os PNGs")
+    parser.add_argument("--politica", choices=POLITICAS, default="fila",
+                        help="O que fazer com quadros novos quando o processamento atrasa")
+    parser.add_argument("--fila", type=int, default=8, help="Tamanho máximo de cada fila (quadros)")
+    parser.add_argument("--fps", type=float, default=None, help="FPS do vídeo de saída (padrão: o da entrada)")
+    parser.add_argument("--sem-espectro", action="store_true", help="Grava só as bordas (sem a FFT)")
+    args = parser.parse_args()
+
+    resumo = processar_fluxo(args.entrada, args.saida, args.politica, args.fila, args.fps,
+                             com_espectro=not args.sem_espectro)
+    imprimir_resumo(resumo)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -1,8 +1,9 @@
 import cv2
 import numpy as np
-import matplotlib.pyplot as plt
 
 def main():
+    import matplotlib.pyplot as plt
+
     # 1. CRIAR O IMPULSO (Delta de Dirac)
     # Usaremos uma imagem pequena (30x30) para facilitar o entendimento
     tamanho = 30